@@ -0,0 +1,10 @@
+# ТФКП, вариант 20: конформное отображение сектора D на круг G.
+#
+# Модули пакета импортируются без побочных действий (Matplotlib и Pillow
+# загружаются только при отрисовке), например:
+#
+#     from tfkp.mapping_chain import f1, f2, f3, eval_chain
+#
+# Запуск из папки src/: python -m tfkp — сборка файлов output/,
+# python -m tfkp.full_mapping — отдельный скрипт (так же conformal_mapping1,
+# conformal_mapping2, conformal_mapping3, pipeline, sweep, bench, preview).
@@ -0,0 +1,70 @@
+# Сборка файлов output/ из командной строки.
+#
+#     python -m tfkp                      # все файлы (из папки src/)
+#     python -m tfkp gif                  # только GIF-анимации
+#     python -m tfkp full_mapping.png conformal_animation1
+#     python -m tfkp --list
+#     python -m tfkp --force static_mapping2
+#     python -m tfkp --profile gif        # плюс отчет output/profile/tfkp.json
+#
+# Файл задается именем с расширением или без (conformal_animation1 — и GIF,
+# и SVG), img, gif и svg — все файлы папки. Актуальные по манифесту
+# output/manifest.json файлы пропускаются (pipeline.build_all), --force
+# пересобирает выбранные. Если файл не удалось сохранить, сборка
+# прерывается с кодом 1, а файл пересобирается при следующем запуске.
+import argparse
+import os
+
+# Группы файлов по папкам output/
+GROUPS = {"img": ".png", "gif": ".gif", "svg": ".svg"}
+
+
+def resolve_targets(names, artifacts):
+    """Имена файлов artifacts по аргументам командной строки names."""
+    targets = []
+    for name in names:
+        if name in GROUPS:
+            found = [a for a in artifacts if a.endswith(GROUPS[name])]
+        elif name in artifacts:
+            found = [name]
+        else:
+            found = [a for a in artifacts if os.path.splitext(a)[0] == name]
+        if not found:
+            raise ValueError(f"Неизвестный файл: {name!r} (список: python -m tfkp --list)")
+        targets.extend(found)
+    return list(dict.fromkeys(targets))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tfkp", description="Сборка картинок и анимаций output/.")
+    parser.add_argument("targets", nargs="*", help="файлы (по умолчанию все), img, gif или svg")
+    parser.add_argument("--list", action="store_true", help="показать доступные файлы и выйти")
+    parser.add_argument("--force", action="store_true", help="пересобрать, даже если файл не изменился")
+    parser.add_argument("--profile", nargs="?", const="time", choices=("time", "memory"),
+                        help="замерить этапы (memory — и память), см. profiling.py")
+    args = parser.parse_args(argv)
+    if args.profile:
+        from tfkp import profiling
+        profiling.enable(memory=args.profile == "memory")
+
+    # pipeline импортируется здесь: --help не загружает модули отрисовки
+    from tfkp import pipeline
+
+    if args.list:
+        for name in pipeline.ARTIFACTS:
+            print(name)
+        return 0
+    try:
+        targets = resolve_targets(args.targets, pipeline.ARTIFACTS) if args.targets else None
+    except ValueError as error:
+        parser.error(str(error))
+    try:
+        pipeline.build_all(force=args.force, targets=targets)
+    except pipeline.BuildError as error:
+        print(f"Сборка прервана: {error}.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
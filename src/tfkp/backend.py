@@ -0,0 +1,91 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from tfkp.mapping_chain import CHUNK_SIZE
+
+# Способ вычисления отображений над большими массивами: 'serial' — блоки
+# по очереди в одном потоке, 'threads' — блоки в пуле потоков (ufunc NumPy
+# отпускают GIL, так что потоки работают параллельно). Переменные
+# окружения TFKP_COMPUTE_BACKEND и TFKP_COMPUTE_THREADS (по умолчанию —
+# число ядер).
+BACKENDS = ("serial", "threads")
+COMPUTE_BACKEND = os.environ.get("TFKP_COMPUTE_BACKEND", "serial")
+COMPUTE_THREADS = int(os.environ.get("TFKP_COMPUTE_THREADS", str(os.cpu_count() or 1)))
+
+# Пул потоков создается при первом использовании и живет до конца процесса
+_pool = {}
+
+
+# =========================================================================
+# 1. РАЗБИЕНИЕ МАССИВА НА ДИАПАЗОНЫ
+# =========================================================================
+
+def split_ranges(size, parts, chunk_size=CHUNK_SIZE):
+    """
+    Делит [0, size) на не больше parts диапазонов (start, stop), границы
+    которых кратны chunk_size, так что внутри диапазона блоки те же, что
+    и при последовательной обработке.
+    """
+    blocks = -(-size // chunk_size)
+    parts = max(1, min(parts, blocks))
+    bounds = [min(size, (blocks * i // parts) * chunk_size) for i in range(parts + 1)]
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def _thread_pool(threads):
+    pool = _pool.get(threads)
+    if pool is None:
+        pool = _pool[threads] = ThreadPoolExecutor(threads, thread_name_prefix="tfkp")
+    return pool
+
+
+def run_ranges(body, size, chunk_size=CHUNK_SIZE, backend=None, threads=None):
+    """
+    Вызывает body(start, stop) для диапазонов, покрывающих [0, size).
+
+    body сам обходит свой диапазон блоками по chunk_size и пишет результат
+    в свою часть выходных массивов, поэтому диапазоны независимы.
+    backend='serial' — один вызов body(0, size); 'threads' — диапазоны
+    (по нескольку на поток, чтобы потоки загружались равномерно)
+    выполняются в пуле из threads потоков. Массивы меньше двух блоков
+    всегда обрабатываются последовательно.
+    """
+    if backend is None:
+        backend = COMPUTE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Неизвестный способ вычисления: {backend!r}, ожидается один из {BACKENDS}")
+    if threads is None:
+        threads = COMPUTE_THREADS
+
+    if backend == "serial" or threads < 2 or size <= chunk_size:
+        body(0, size)
+        return
+    pool = _thread_pool(threads)
+    # list() дожидается всех диапазонов и передает исключения
+    list(pool.map(lambda r: body(*r), split_ranges(size, 4 * threads, chunk_size)))
+
+
+# =========================================================================
+# 2. ПОЭЛЕМЕНТНЫЕ ОТОБРАЖЕНИЯ
+# =========================================================================
+
+def parallel_map(func, z, out=None, chunk_size=CHUNK_SIZE, backend=None, threads=None):
+    """
+    Вычисляет поэлементное отображение func (например, f1 или mapping
+    скрипта) над массивом z блоками по chunk_size точек, выбранным
+    способом backend. Результат побитово совпадает с func(z).
+    """
+    z = np.asarray(z)
+    if out is None:
+        out = np.empty(z.shape, dtype=np.result_type(z.dtype, np.complex64))
+    flat, target = z.reshape(-1), out.reshape(-1)
+
+    def body(start, stop):
+        for a in range(start, stop, chunk_size):
+            b = min(a + chunk_size, stop)
+            target[a:b] = func(flat[a:b])
+
+    run_ranges(body, flat.size, chunk_size, backend, threads)
+    return out
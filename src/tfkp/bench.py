@@ -0,0 +1,309 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Папка результатов замеров (не хранится в git, см. .gitignore):
+# results.json — последний запуск, baseline.json — эталон для сравнения
+BENCH_DIR = os.path.join(project_root, "output", "bench")
+
+# Допустимое ухудшение относительно эталона (0.25 — на 25%); переменная
+# окружения TFKP_BENCH_TOLERANCE. Разницы меньше порогов шума
+# (NOISE_SECONDS, NOISE_MB) не считаются ухудшением.
+BENCH_TOLERANCE = float(os.environ.get("TFKP_BENCH_TOLERANCE", "0.25"))
+NOISE_SECONDS = 0.05
+NOISE_MB = 5.0
+
+STAGES = ("grid", "mapping", "static", "gif")
+
+
+# =========================================================================
+# 1. ЭТАПЫ
+# =========================================================================
+
+# Каждый этап — функция от параметров случая, выполняемая в отдельном
+# процессе; возвращает (время в секундах, размер результата в байтах).
+# Время — только самого этапа, без подготовки входных данных.
+
+def bench_grid(points):
+    """get_grid_points с числом точек сетки около points."""
+    from tfkp.full_mapping import get_grid_points
+
+    n_rays, n_arcs = 30, 15
+    samples = max(2, points // (n_rays + n_arcs))
+    start = time.perf_counter()
+    Z = get_grid_points(n_rays, n_arcs, samples)
+    return time.perf_counter() - start, Z.nbytes
+
+
+def bench_mapping(points, block=2 ** 20):
+    """
+    eval_chain (f1, f2, f3) над points точками сектора D. Точки берутся
+    блоками по block, так что память не зависит от points (до 10^8 и больше).
+    """
+    from tfkp.clouds import sample_sector
+    from tfkp.mapping_chain import eval_chain
+
+    z = sample_sector(min(points, block))
+    out = [np.empty_like(z) for _ in range(3)]
+    elapsed, done = 0.0, 0
+    while done < points:
+        n = min(len(z), points - done)
+        start = time.perf_counter()
+        eval_chain(z[:n], out=[o[:n] for o in out])
+        elapsed += time.perf_counter() - start
+        done += n
+    return elapsed, 3 * points * z.itemsize
+
+
+def bench_static(points, renderer, directory):
+    """save_full_static_image по облаку из points точек."""
+    from tfkp import full_mapping
+    from tfkp.mapping_chain import CHUNK_SIZE
+
+    # Процесс замера отдельный, так что папка подменяется только в нем
+    full_mapping.img_dir = directory
+    streaming = renderer != "scatter"
+    start = time.perf_counter()
+    full_mapping.save_full_static_image(points, chunk_size=CHUNK_SIZE if streaming else None,
+                                        renderer=renderer)
+    elapsed = time.perf_counter() - start
+    return elapsed, os.path.getsize(os.path.join(directory, "full_mapping.png"))
+
+
+def bench_gif(scale, dpi, renderer, directory, encoder=None):
+    """
+    Анимация full_mapping: сценарий TIMELINE, растянутый в scale раз
+    (число кадров), с разрешением dpi, способом отрисовки renderer и
+    сжатием encoder (gif_render.save_animation). renderer='pillow' —
+    исходный путь FuncAnimation.save с PillowWriter (все кадры в памяти
+    до конца записи, без схлопывания пауз) для сравнения.
+    """
+    from functools import partial
+
+    from tfkp import full_mapping
+    from tfkp.timeline import Timeline
+
+    grid = full_mapping.get_animation_grid()
+    full_mapping.TIMELINE = Timeline(full_mapping.TIMELINE.steps, scale=scale)
+    frames = full_mapping.TIMELINE.frames
+    path = os.path.join(directory, "animation.gif")
+    start = time.perf_counter()
+    if renderer == "pillow":
+        import matplotlib.pyplot as plt
+        from matplotlib.animation import FuncAnimation, PillowWriter
+
+        fig, update = full_mapping.build_animation(*grid)
+        ani = FuncAnimation(fig, update, frames=frames, interval=60, blit=True)
+        ani.save(path, writer=PillowWriter(fps=15), dpi=dpi)
+        plt.close(fig)
+    else:
+        from tfkp.gif_render import save_animation
+
+        save_animation(partial(full_mapping.build_animation, *grid), frames, path, fps=15,
+                       interval=60, workers=1, dpi=dpi, renderer=renderer, encoder=encoder)
+    elapsed = time.perf_counter() - start
+    return elapsed, os.path.getsize(path)
+
+
+BENCHMARKS = {"grid": bench_grid, "mapping": bench_mapping, "static": bench_static, "gif": bench_gif}
+
+
+# =========================================================================
+# 2. НАБОР СЛУЧАЕВ
+# =========================================================================
+
+def point_counts(max_points):
+    """10^3, 10^4, ... до max_points."""
+    return [10 ** k for k in range(3, 20) if 10 ** k <= max_points]
+
+
+def bench_cases(stages=STAGES, max_points=10 ** 6, scales=(0.5, 1, 2), dpis=(50, 100)):
+    """
+    Список случаев (stage, params): сетки и отображения — по всем числам
+    точек до max_points; схема — точками (scatter, до 10^5) и картинкой
+    плотности (density, потоково); анимация — по числу кадров (scales)
+    и dpi для обоих способов отрисовки, плюс своя палитра у каждого кадра
+    (encoder='adaptive') и исходный путь FuncAnimation + PillowWriter.
+    """
+    cases = []
+    for stage in stages:
+        if stage not in STAGES:
+            raise ValueError(f"Неизвестный этап: {stage!r}, ожидается один из {STAGES}")
+        if stage in ("grid", "mapping"):
+            cases += [(stage, {"points": n}) for n in point_counts(max_points)]
+        elif stage == "static":
+            cases += [(stage, {"points": n, "renderer": "scatter"})
+                      for n in point_counts(min(max_points, 10 ** 5))]
+            cases += [(stage, {"points": n, "renderer": "density"}) for n in point_counts(max_points)]
+        else:
+            for renderer in ("matplotlib", "numpy"):
+                cases += [(stage, {"scale": s, "dpi": d, "renderer": renderer, "encoder": "delta"})
+                          for s in scales for d in dpis]
+            cases.append((stage, {"scale": 1, "dpi": 100, "renderer": "matplotlib", "encoder": "adaptive"}))
+            cases.append((stage, {"scale": 1, "dpi": 100, "renderer": "pillow"}))
+    return cases
+
+
+def case_name(stage, params):
+    return stage + " " + " ".join(f"{k}={v}" for k, v in params.items())
+
+
+# =========================================================================
+# 3. ЗАМЕР ОДНОГО СЛУЧАЯ
+# =========================================================================
+
+def peak_memory_mb():
+    """Пиковый размер памяти процесса (МБ); None, если ОС не сообщает его."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux сообщает килобайты, macOS — байты
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def _run_case(task):
+    """
+    Выполняет случай в отдельном процессе repeat раз (но не дольше budget
+    секунд после первого) и возвращает запись результата. Пиковая память —
+    прирост пика процесса за время этапа, отдельно от импортов.
+    """
+    stage, params, repeat, budget = task
+    # Вывод этапов (сообщения о сохранении, прогресс облака) не нужен;
+    # исключения все равно передаются в основной процесс
+    sys.stdout = sys.stderr = open(os.devnull, "w")
+    # Модули загружаются до замера, чтобы их память не входила в прирост
+    from tfkp import full_mapping  # noqa: F401
+    if stage in ("static", "gif"):
+        import matplotlib.pyplot  # noqa: F401
+        from tfkp import gif_render  # noqa: F401
+    before = peak_memory_mb()
+    times, size = [], None
+    with tempfile.TemporaryDirectory(prefix="tfkp-bench-") as directory:
+        kwargs = dict(params)
+        if stage in ("static", "gif"):
+            kwargs["directory"] = directory
+        while len(times) < repeat and (not times or sum(times) < budget):
+            elapsed, size = BENCHMARKS[stage](**kwargs)
+            times.append(elapsed)
+    after = peak_memory_mb()
+    return {
+        "name": case_name(stage, params),
+        "stage": stage,
+        "params": params,
+        "wall_s": min(times),
+        "runs": times,
+        "peak_mb": after,
+        "peak_delta_mb": None if before is None else after - before,
+        "output_bytes": size,
+    }
+
+
+def run_benchmarks(cases, repeat=3, budget=2.0):
+    """
+    Замеряет все случаи cases, каждый в новом процессе (spawn), чтобы
+    пиковая память и кэши одного случая не влияли на другие.
+    Время случая — минимум по повторам.
+    """
+    ctx = mp.get_context("spawn")
+    results = []
+    for stage, params in cases:
+        with ProcessPoolExecutor(1, mp_context=ctx) as pool:
+            record = pool.submit(_run_case, (stage, params, repeat, budget)).result()
+        print(f"{record['name']}: {record['wall_s']:.3f} с, "
+              f"память +{record['peak_delta_mb'] or 0:.1f} МБ, результат {record['output_bytes']} байт")
+        results.append(record)
+    return results
+
+
+# =========================================================================
+# 4. СРАВНЕНИЕ С ЭТАЛОНОМ
+# =========================================================================
+
+def bench_environment():
+    """Описание машины и настроек: замеры сравнимы только при одинаковом."""
+    from tfkp.pipeline import environment
+
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "cpus": os.cpu_count(), "libraries": environment()}
+
+
+def compare(results, baseline, tolerance=None):
+    """
+    Список ухудшений results относительно baseline (оба — списки записей
+    run_benchmarks): время, прирост памяти или размер результата больше
+    эталонного более чем на tolerance (и больше порога шума).
+    """
+    if tolerance is None:
+        tolerance = BENCH_TOLERANCE
+    reference = {record["name"]: record for record in baseline}
+    regressions = []
+    for record in results:
+        base = reference.get(record["name"])
+        if base is None:
+            continue
+        for field, noise in (("wall_s", NOISE_SECONDS), ("peak_delta_mb", NOISE_MB), ("output_bytes", 0)):
+            new, old = record.get(field), base.get(field)
+            if new is None or old is None:
+                continue
+            if new > old * (1 + tolerance) and new - old > noise:
+                regressions.append({"name": record["name"], "field": field, "baseline": old, "value": new})
+    return regressions
+
+
+def save_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(data, fp, indent=2, ensure_ascii=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tfkp.bench",
+                                     description="Замеры этапов: сетки, отображения, схема, GIF.")
+    parser.add_argument("stages", nargs="*", default=list(STAGES), help=f"этапы из {STAGES} (по умолчанию все)")
+    parser.add_argument("--max-points", type=float, default=1e6, help="наибольшее число точек (до 1e8)")
+    parser.add_argument("--repeat", type=int, default=3, help="число повторов случая (время — минимум)")
+    parser.add_argument("--budget", type=float, default=2.0, help="не повторять случай дольше, с")
+    parser.add_argument("--output", default=os.path.join(BENCH_DIR, "results.json"))
+    parser.add_argument("--baseline", default=os.path.join(BENCH_DIR, "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="записать результаты как эталон")
+    parser.add_argument("--tolerance", type=float, default=None, help="допустимое ухудшение (0.25 — 25%%)")
+    args = parser.parse_args(argv)
+
+    cases = bench_cases(args.stages, int(args.max_points))
+    report = {"environment": bench_environment(), "results": run_benchmarks(cases, args.repeat, args.budget)}
+    save_json(args.output, report)
+    print(f"Результаты записаны в '{args.output}'.")
+
+    if args.save_baseline:
+        save_json(args.baseline, report)
+        print(f"Эталон записан в '{args.baseline}'.")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("Эталона нет: сохраните его с --save-baseline.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as fp:
+        baseline = json.load(fp)
+    if baseline.get("environment") != report["environment"]:
+        print("Внимание: эталон снят на другой машине или с другими настройками.")
+    regressions = compare(report["results"], baseline["results"], args.tolerance)
+    for r in regressions:
+        print(f"Ухудшение: {r['name']}: {r['field']} {r['baseline']:.4g} -> {r['value']:.4g}")
+    if not regressions:
+        print("Ухудшений относительно эталона нет.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,237 @@
+import os
+import sys
+
+import numpy as np
+
+from tfkp.mapping_chain import CHUNK_SIZE
+from tfkp.profiling import span
+
+# =========================================================================
+# 1. ГЕНЕРАТОРЫ СЛУЧАЙНЫХ ТОЧЕК В ОБЛАСТЯХ D, H, K
+# =========================================================================
+
+# Диапазоны np.angle(z) исходного облака: задают нормировку цветовой карты
+# 'hsv', одинаковую для всех блоков потока.
+SECTOR_HUE = (np.pi / 4, 3 * np.pi / 4)
+HALF_PLANE_HUE = (np.arctan2(0.1, 4), np.pi - np.arctan2(0.1, 4))
+DISK_HUE = (-np.pi, np.pi)
+
+
+# Способ выборки точек облака: 'random' — псевдослучайные точки,
+# 'stratified' — латинский гиперкуб (по одной точке в каждой полосе по
+# обеим координатам), 'halton' и 'sobol' — квазислучайные
+# последовательности, равномерно заполняющие область уже при небольшом
+# числе точек. Переменные окружения TFKP_CLOUD_SAMPLER и TFKP_CLOUD_SEED.
+SAMPLERS = ("random", "stratified", "halton", "sobol")
+CLOUD_SAMPLER = os.environ.get("TFKP_CLOUD_SAMPLER", "halton")
+CLOUD_SEED = int(os.environ.get("TFKP_CLOUD_SEED", "0"))
+
+# Разрядность и направляющие числа второй координаты Соболя
+# (многочлен x + 1: m_k = 2 m_{k-1} xor m_{k-1}, m_1 = 1)
+SOBOL_BITS = 32
+SOBOL_DIRECTIONS = [1]
+for _ in range(SOBOL_BITS - 1):
+    SOBOL_DIRECTIONS.append((SOBOL_DIRECTIONS[-1] << 1) ^ SOBOL_DIRECTIONS[-1])
+
+
+def radical_inverse(index, base):
+    """Отражение цифр index (целые >= 0) в системе base относительно запятой."""
+    index = np.array(index, dtype=np.int64)
+    result = np.zeros(index.shape)
+    scale = 1.0 / base
+    while np.any(index > 0):
+        index, digit = np.divmod(index, base)
+        result += digit * scale
+        scale /= base
+    return result
+
+
+def sobol_2d(index):
+    """Точки index (целые >= 0) двумерной последовательности Соболя."""
+    index = np.array(index, dtype=np.uint64)
+    v = np.zeros(index.shape, dtype=np.uint64)
+    for k, m in enumerate(SOBOL_DIRECTIONS):
+        bit = (index >> np.uint64(k)) & np.uint64(1)
+        v ^= bit * np.uint64(m << (SOBOL_BITS - 1 - k))
+    return radical_inverse(index, 2), v / float(1 << SOBOL_BITS)
+
+
+def unit_square(num_pts, start=0, method=None, seed=None):
+    """
+    Точки start, ..., start + num_pts - 1 выборки method в квадрате
+    [0, 1)^2 как пара массивов (u, v).
+
+    Выборка полностью определяется seed: для 'random' и 'stratified'
+    он вместе со start задает генератор, для 'halton' и 'sobol' — общий
+    для всех точек случайный сдвиг по модулю 1 (сдвиг сохраняет
+    равномерность последовательности). Поэтому облако, набранное блоками
+    (iter_cloud_chunks), для квазислучайных выборок совпадает с облаком,
+    полученным за один вызов.
+    """
+    if method is None:
+        method = CLOUD_SAMPLER
+    if seed is None:
+        seed = CLOUD_SEED
+    if method not in SAMPLERS:
+        raise ValueError(f"Неизвестный способ выборки: {method!r}, ожидается один из {SAMPLERS}")
+
+    if method in ("random", "stratified"):
+        rng = np.random.default_rng([seed, start])
+        if method == "random":
+            u, v = rng.random((2, num_pts))
+        else:
+            u = (rng.permutation(num_pts) + rng.random(num_pts)) / num_pts
+            v = (rng.permutation(num_pts) + rng.random(num_pts)) / num_pts
+        return u, v
+
+    index = np.arange(start, start + num_pts)
+    if method == "halton":
+        u, v = radical_inverse(index, 2), radical_inverse(index, 3)
+    else:
+        u, v = sobol_2d(index)
+    shift_u, shift_v = np.random.default_rng(seed).random(2)
+    return (u + shift_u) % 1.0, (v + shift_v) % 1.0
+
+
+def sample_sector(num_pts, start=0, method=None, seed=None):
+    """Равномерное облако в секторе D: |z| < 2, pi/4 < arg(z) < 3pi/4."""
+    u, v = unit_square(num_pts, start, method, seed)
+    r = np.sqrt(4 * u)  # sqrt для равномерности круга
+    t = np.pi / 4 + (3 * np.pi / 4 - np.pi / 4) * v
+    return r * np.exp(1j * t)
+
+
+def sample_half_plane(num_pts, start=0, method=None, seed=None):
+    """Равномерное облако в прямоугольнике [-4, 4] x [0.1, 4] из H."""
+    u, v = unit_square(num_pts, start, method, seed)
+    return (-4 + 8 * u) + 1j * (0.1 + 3.9 * v)
+
+
+def sample_disk(num_pts, start=0, method=None, seed=None):
+    """Равномерное облако в единичном круге K."""
+    u, v = unit_square(num_pts, start, method, seed)
+    r = np.sqrt(u)
+    t = 2 * np.pi * v
+    return r * np.exp(1j * t)
+
+
+# =========================================================================
+# 2. ПОТОКОВАЯ ОБРАБОТКА ОБЛАКА БЛОКАМИ
+# =========================================================================
+
+def print_progress(done, total):
+    """Печатает прогресс обработки облака в одну строку."""
+    print(f"\r  Обработано точек: {done}/{total} ({100 * done / total:.0f}%)",
+          end="" if done < total else "\n", file=sys.stderr, flush=True)
+
+
+def iter_cloud_chunks(sampler, num_pts, mapper=None, chunk_size=CHUNK_SIZE,
+                      progress=print_progress):
+    """
+    Генератор облака точек блоками по chunk_size точек.
+
+    sampler(n, start=k) возвращает n исходных точек с номерами k, k + 1, ...
+    (как sample_sector), mapper(z) — кортеж образов (например,
+    eval_chain). Каждый шаг отдает кортеж (z, *mapper(z)),
+    поэтому в памяти одновременно находится лишь один блок,
+    независимо от num_pts.
+    """
+    done = 0
+    while done < num_pts:
+        n = min(chunk_size, num_pts - done)
+        with span("sample"):
+            z = sampler(n, start=done)
+        with span("map"):
+            chunk = (z,) + (tuple(mapper(z)) if mapper is not None else ())
+        yield chunk
+        done += n
+        if progress is not None:
+            progress(done, num_pts)
+
+
+# =========================================================================
+# 3. ОТРИСОВКА ПОТОКА БЛОКОВ
+# =========================================================================
+
+def fit_limits(ax, corners):
+    """
+    Выставляет пределы оси так же, как автомасштаб по облаку, заполняющему
+    прямоугольник corners = ((x_min, y_min), (x_max, y_max)).
+    Нужна в потоковом режиме, где данных в оси нет.
+    """
+    ax.update_datalim(corners)
+    ax.autoscale_view()
+
+
+def save_cloud_stream(fig, axes, chunks, hue_range, path, dpi=200,
+                      cmap='hsv', s=1, alpha=0.5):
+    """
+    Рисует поток блоков облака и сохраняет фигуру в path.
+
+    Фигура fig должна быть полностью оформлена (заголовки, пределы,
+    окружности, tight_layout). i-й массив каждого блока рисуется на оси
+    axes[i], цвет точки — np.angle исходной точки блока.
+
+    Сначала рисуется только фон осей, затем каждый блок отрисовывается
+    прямо в буфер Agg (ax.draw_artist) и сразу удаляется, а в конце
+    поверх точек дорисовываются остальные элементы осей. Так картинка
+    совпадает с обычным scatter, а память не растет с числом точек.
+    """
+    from matplotlib.colors import Normalize
+    from matplotlib.text import Text
+    import matplotlib.image as mpimg
+
+    fig.set_dpi(dpi)
+    norm = Normalize(*hue_range)
+
+    # Точки должны оказаться под линиями, окружностями и сеткой:
+    # временно скрываем все, кроме фона и заголовков, и фиксируем пределы
+    # осей. Заголовки лежат вне области точек, а скрытый заголовок
+    # Matplotlib сдвигает при расчете его положения.
+    hidden = []
+    for ax in axes:
+        ax.set_xlim(ax.get_xlim())
+        ax.set_ylim(ax.get_ylim())
+        for artist in ax.get_children():
+            if artist is ax.patch or isinstance(artist, Text):
+                continue
+            if artist.get_visible():
+                artist.set_visible(False)
+                hidden.append((ax, artist))
+    fig.canvas.draw()
+
+    for chunk in chunks:
+        with span("scatter"):
+            colors = np.angle(chunk[0])
+            for ax, pts in zip(axes, chunk):
+                sc = ax.scatter(pts.real, pts.imag, c=colors, cmap=cmap, norm=norm,
+                                s=s, alpha=alpha)
+                ax.draw_artist(sc)
+                sc.remove()
+
+    # Дорисовываем скрытые элементы в порядке zorder, как это делает Axes.draw
+    for ax, artist in sorted(hidden, key=lambda item: item[1].get_zorder()):
+        artist.set_visible(True)
+        ax.draw_artist(artist)
+
+    with span("savefig"):
+        mpimg.imsave(path, np.asarray(fig.canvas.buffer_rgba()), dpi=dpi)
+
+
+# Способы отрисовки облака для save_cloud
+RENDERERS = ("scatter", "density")
+
+
+def save_cloud(fig, axes, chunks, hue_range, path, renderer="scatter", dpi=200):
+    """
+    Сохраняет поток блоков облака выбранным способом:
+    'scatter' — точки Matplotlib (save_cloud_stream),
+    'density' — картинки плотности со средним цветом (density.save_cloud_density).
+    """
+    if renderer == "scatter":
+        save_cloud_stream(fig, axes, chunks, hue_range, path, dpi=dpi)
+    elif renderer == "density":
+        from tfkp.density import save_cloud_density
+        save_cloud_density(fig, axes, chunks, hue_range, path, dpi=dpi)
+    else:
+        raise ValueError(f"Неизвестный способ отрисовки: {renderer!r}, ожидается один из {RENDERERS}")
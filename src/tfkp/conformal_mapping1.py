@@ -0,0 +1,234 @@
+import numpy as np
+import os
+from functools import partial
+
+from tfkp.clouds import SECTOR_HUE, fit_limits, iter_cloud_chunks, sample_sector, save_cloud
+from tfkp.frame_store import FRAME_STORE, open_frame_store
+from tfkp.grids import GRID_TOL, PILOT_SAMPLES, grid_dtype, polar_grid, thin_grid
+from tfkp.mapping_chain import CHUNK_SIZE
+from tfkp.profiling import profiled, span
+from tfkp.timeline import Hold, Move, Timeline
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Пути для сохранения
+img_dir = os.path.join(project_root, "output", "img")
+gif_dir = os.path.join(project_root, "output", "gif")
+svg_dir = os.path.join(project_root, "output", "svg")
+
+
+# === 1. ГЕНЕРАЦИЯ ТОЧЕК (Сектор) ===
+def get_grid_points(n_rays=30, n_arcs=15, samples=100, dtype=complex):
+    """
+    Создает сетку точек в секторе pi/4 < arg(z) < 3pi/4.
+    Используем полярную сетку для красивых линий сетки: n_rays лучей,
+    n_arcs дуг, по samples точек на линию, линии разделены NaN.
+    dtype — тип точек (complex64 в режиме одинарной точности).
+    """
+    # Радиусы от 0.1 до 2.0
+    rs = np.linspace(0.1, 2.0, n_arcs)
+    # Углы от pi/4 до 3pi/4
+    thetas = np.linspace(np.pi / 4, 3 * np.pi / 4, n_rays)
+
+    return polar_grid(rs, thetas, 2.0, (np.pi / 4, 3 * np.pi / 4), samples, dtype)
+
+
+# === 2. ФУНКЦИЯ ОТОБРАЖЕНИЯ ===
+def mapping(z):
+    # z_1 = -i * z^2
+    return -1j * (z ** 2)
+
+
+# === 3. ПОДГОТОВКА ДАННЫХ ===
+def get_animation_grid():
+    """
+    Сетка D и ее образ в H для анимации: (Z, Z1).
+    Плотная сетка прореживается по кривизне линий на обоих этапах
+    (grids.thin_grid): точек больше там, где образ линии изгибается или
+    неравномерно растягивается, и меньше на почти прямых участках.
+    """
+    Z = get_grid_points(samples=PILOT_SAMPLES, dtype=grid_dtype())
+    return thin_grid((Z, mapping(Z)), PILOT_SAMPLES, GRID_TOL)
+
+
+# === 4. СТАТИЧЕСКАЯ КАРТИНКА (ДЛЯ ОТЧЕТА) ===
+@profiled()
+def save_static_report_image(num_pts=10000, chunk_size=None, renderer="scatter", cloud=None):
+    """
+    Сохраняет картинку D -> H по облаку из num_pts точек.
+    Если задан chunk_size, облако обрабатывается блоками (потоковый режим,
+    память не зависит от num_pts). renderer='density' рисует облако
+    картинками плотности вместо отдельных точек. cloud — готовое облако
+    (Z_cloud, Z1_cloud), например общее для всех картинок (pipeline.py).
+    """
+    import matplotlib.pyplot as plt
+
+    # Создание папок для сохранения, если они не существуют
+    os.makedirs(img_dir, exist_ok=True)
+    streaming = chunk_size is not None or renderer != "scatter"
+    fig, ax = plt.subplots(1, 2, figsize=(12, 5))
+
+    if not streaming:
+        # Генерируем плотное облако точек для красивой картинки в отчет
+        # (в отличие от линий сетки выше)
+        if cloud is None:
+            with span("sample"):
+                Z_cloud = sample_sector(num_pts)
+            with span("map"):
+                cloud = (Z_cloud, mapping(Z_cloud))
+        Z_cloud, Z1_cloud = cloud
+
+        # Раскраска по углу (чтобы видеть, куда переходят границы)
+        colors = np.angle(Z_cloud)
+
+        with span("scatter"):
+            ax[0].scatter(Z_cloud.real, Z_cloud.imag, c=colors, cmap='hsv', s=1, alpha=0.5)
+            ax[1].scatter(Z1_cloud.real, Z1_cloud.imag, c=colors, cmap='hsv', s=1, alpha=0.5)
+    else:
+        # Данных в осях нет: пределы как у автомасштаба по облакам,
+        # заполняющим сектор D и полукруг |z1| < 4 в H
+        fit_limits(ax[0], [(-np.sqrt(2), 0), (np.sqrt(2), 2)])
+        fit_limits(ax[1], [(-4, 0), (4, 4)])
+
+    # Plot 1: Source
+    ax[0].set_title("Исходная область $D$\n($\\pi/4 < \\arg z < 3\\pi/4$)")
+    ax[0].axhline(0, color='k', lw=0.8)
+    ax[0].axvline(0, color='k', lw=0.8)
+    ax[0].grid(True, alpha=0.3)
+    ax[0].set_aspect('equal')
+
+    # Plot 2: Target
+    ax[1].set_title("Результат отображения $H$\n($z_1 = -i z^2$)")
+    ax[1].axhline(0, color='k', lw=0.8)
+    ax[1].axvline(0, color='k', lw=0.8)
+    ax[1].grid(True, alpha=0.3)
+    ax[1].set_aspect('equal')
+
+    with span("tight_layout"):
+        plt.tight_layout()
+    path = os.path.join(img_dir, "static_mapping1.png")
+    if not streaming:
+        with span("savefig"):
+            plt.savefig(path, dpi=200)
+    else:
+        chunks = iter_cloud_chunks(sample_sector, num_pts, lambda z: (mapping(z),), chunk_size or CHUNK_SIZE)
+        save_cloud(fig, ax, chunks, SECTOR_HUE, path, renderer=renderer, dpi=200)
+    print("Картинка 'static_mapping1.png' сохранена.")
+    plt.close()
+
+
+# === 5. АНИМАЦИЯ ===
+
+def frame_position(frame, Z, Z1):
+    """Положение сетки в кадре frame: линейная интерполяция между Z и Z1."""
+    # В одинарной точности t тоже float32, чтобы не повышать тип сеток
+    t = Z.real.dtype.type(frame)
+    return (1 - t) * Z + t * Z1
+
+
+# Пределы осей анимации (GIF и SVG)
+ANIMATION_XLIM = (-4.5, 4.5)
+ANIMATION_YLIM = (-1, 4.5)
+
+
+def build_animation(Z, Z1, store=None):
+    """
+    Создает фигуру анимации перехода от сетки Z к Z1 и функцию
+    update(frame) для нее (см. gif_render.save_animation).
+    store — FrameStore с готовыми положениями сетки во всех кадрах
+    (frame_store.py); без него положения вычисляются в каждом кадре.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(7, 7))
+    ax.set_xlim(ANIMATION_XLIM)
+    ax.set_ylim(ANIMATION_YLIM)
+    ax.axhline(0, color='black', linewidth=1)
+    ax.axvline(0, color='black', linewidth=1)
+    ax.grid(True, linestyle='--', alpha=0.4)
+    ax.set_aspect('equal')
+
+    line_plot, = ax.plot([], [], 'b-', lw=1, alpha=0.6)
+    title = ax.set_title("Conformal Mapping")
+
+    def update(frame):
+        t = frame  # t меняется от 0 до 1
+
+        if store is None:
+            Z_curr = frame_position(frame, Z, Z1)
+            line_plot.set_data(Z_curr.real, Z_curr.imag)
+        else:
+            line_plot.set_data(*store[frame])
+
+        # Меняем цвет заголовка или текст
+        if t < 0.01:
+            title.set_text("Начало: Данное изображение сектора")
+        elif t > 0.99:
+            title.set_text("Конец: Верхняя полуплоскость")
+        else:
+            title.set_text(f"Изменение... t={t:.2f}")
+
+        return line_plot, title
+
+    return fig, update
+
+
+# Кадры: 10 пауз в начале, 60 кадров движения, 20 пауз в конце
+frames = np.concatenate([np.zeros(10), np.linspace(0, 1, 80), np.ones(20)])
+# Тот же сценарий для SVG-анимации (svg_render.py): заголовок перехода без t
+SVG_TIMELINE = Timeline([
+    Hold(10, "Начало: Данное изображение сектора"),
+    Move(80, "Изменение..."),
+    Hold(20, "Конец: Верхняя полуплоскость"),
+])
+
+
+@profiled()
+def save_report_animation(grid=None, frame_store=None):
+    """
+    Сохраняет анимацию D -> H; grid — (Z, Z1), по умолчанию get_animation_grid().
+    При frame_store=True (по умолчанию FRAME_STORE) положения сетки во всех
+    кадрах берутся из файла кадров (frame_store.open_frame_store).
+    Возвращает True, если GIF сохранен (ошибка сохранения только выводится).
+    """
+    from tfkp.gif_render import save_animation
+
+    # Создание папок для сохранения, если они не существуют
+    os.makedirs(gif_dir, exist_ok=True)
+    if grid is None:
+        with span("grid"):
+            grid = get_animation_grid()
+    if frame_store is None:
+        frame_store = FRAME_STORE
+    store = open_frame_store("animation1", frame_position, frames, grid) if frame_store else None
+    try:
+        save_animation(partial(build_animation, *grid, store=store), frames,
+                       os.path.join(gif_dir, "conformal_animation1.gif"), fps=25, interval=40)
+        print("Анимация 'conformal_animation1.gif' сохранена.")
+        return True
+    except Exception as e:
+        print(f"Не удалось сохранить GIF: {e}")
+        return False
+
+
+@profiled()
+def save_report_svg(grid=None):
+    """
+    Сохраняет анимацию D -> H векторной SVG (svg_render.py): сетки (Z, Z1)
+    записываются один раз, а промежуточные кадры рисует браузер.
+    """
+    from tfkp.svg_render import save_svg_animation
+
+    os.makedirs(svg_dir, exist_ok=True)
+    if grid is None:
+        with span("grid"):
+            grid = get_animation_grid()
+    save_svg_animation(os.path.join(svg_dir, "conformal_animation1.svg"), grid, SVG_TIMELINE, 25,
+                       ANIMATION_XLIM, ANIMATION_YLIM)
+    print("Анимация 'conformal_animation1.svg' сохранена.")
+
+
+if __name__ == "__main__":
+    save_static_report_image()
+    save_report_animation()
+    save_report_svg()
\ No newline at end of file
@@ -0,0 +1,259 @@
+import numpy as np
+import os
+from functools import partial
+
+from tfkp.clouds import HALF_PLANE_HUE, iter_cloud_chunks, sample_half_plane, save_cloud
+from tfkp.frame_store import FRAME_STORE, open_frame_store
+from tfkp.grids import GRID_TOL, PILOT_SAMPLES, grid_dtype, rect_grid, thin_grid
+from tfkp.mapping_chain import CHUNK_SIZE, promote_near_pole
+from tfkp.profiling import profiled, span
+from tfkp.timeline import Hold, Move, Timeline
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Пути для сохранения
+img_dir = os.path.join(project_root, "output", "img")
+gif_dir = os.path.join(project_root, "output", "gif")
+svg_dir = os.path.join(project_root, "output", "svg")
+
+
+# =========================================================================
+# 1. ГЕНЕРАЦИЯ СЕТКИ (для исходной области H: Im(z1) > 0)
+# =========================================================================
+
+def get_grid_points(n_vertical=15, n_horizontal=10, samples=100, dtype=complex):
+    """
+    Создает сетку точек в Верхней полуплоскости H.
+    Используем прямоугольную сетку: n_vertical вертикальных и
+    n_horizontal горизонтальных линий, по samples точек на линию.
+    dtype — тип точек (complex64 в режиме одинарной точности).
+    """
+
+    # Вещественные линии (вертикальные)
+    reals = np.linspace(-4, 4, n_vertical)
+    # Мнимые линии (горизонтальные)
+    imags = np.linspace(0.1, 4, n_horizontal)
+
+    return rect_grid(reals, imags, (-4, 4), (0, 4), samples, dtype)
+
+
+# =========================================================================
+# 2. ФУНКЦИЯ ОТОБРАЖЕНИЯ (Шаг 2: H -> K)
+# =========================================================================
+
+def mapping(z1):
+    """
+    Отображение Верхней полуплоскости H на Единичный круг K.
+    z2 = (z1 - i) / (z1 + i)
+    """
+    z2 = (z1 - 1j) / (z1 + 1j)
+    if isinstance(z2, np.ndarray) and z2.dtype == np.complex64:
+        # В одинарной точности точки около полюса z1 = -i
+        # пересчитываются в двойной (скаляры считаются как есть)
+        promote_near_pole(z1, z2)
+    return z2
+
+
+def get_animation_grid():
+    """
+    Исходные и конечные точки сетки для анимации: (Z1, Z2).
+    Плотная сетка прореживается по кривизне линий на обоих этапах
+    (grids.thin_grid): точек больше там, где образ линии изгибается или
+    неравномерно растягивается, и меньше на почти прямых участках.
+    """
+    Z1 = get_grid_points(samples=PILOT_SAMPLES, dtype=grid_dtype())
+    return thin_grid((Z1, mapping(Z1)), PILOT_SAMPLES, GRID_TOL)
+
+
+# =========================================================================
+# 3. СОХРАНЕНИЕ СТАТИЧЕСКОЙ КАРТИНКИ (для отчета)
+# =========================================================================
+
+@profiled()
+def save_static_report_image(num_pts=10000, chunk_size=None, renderer="scatter", cloud=None):
+    """
+    Генерирует и сохраняет статическое изображение для отчета,
+    сравнивающее исходную и отображенную области.
+    Если задан chunk_size, облако из num_pts точек обрабатывается блоками
+    (потоковый режим, память не зависит от num_pts). renderer='density'
+    рисует облако картинками плотности вместо отдельных точек.
+    cloud — готовое облако (Z1_cloud, Z2_cloud), например общее для всех
+    картинок (pipeline.py).
+    """
+    import matplotlib.pyplot as plt
+
+    # Создание папок для сохранения, если они не существуют
+    os.makedirs(img_dir, exist_ok=True)
+    streaming = chunk_size is not None or renderer != "scatter"
+    fig, ax = plt.subplots(1, 2, figsize=(12, 5))
+
+    if not streaming:
+        # Генерируем плотное облако точек
+        if cloud is None:
+            with span("sample"):
+                Z1_cloud = sample_half_plane(num_pts)
+            with span("map"):
+                cloud = (Z1_cloud, mapping(Z1_cloud))
+        Z1_cloud, Z2_cloud = cloud
+
+        # Раскраска по углу (чтобы отследить конформность)
+        colors = np.angle(Z1_cloud)
+
+        with span("scatter"):
+            ax[0].scatter(Z1_cloud.real, Z1_cloud.imag, c=colors, cmap='hsv', s=1, alpha=0.5)
+            ax[1].scatter(Z2_cloud.real, Z2_cloud.imag, c=colors, cmap='hsv', s=1, alpha=0.5)
+
+    # Левая часть: Исходная область H
+    ax[0].set_title("Исходная область $H$\n($\\text{Im } z_1 > 0$)")
+    ax[0].axhline(0, color='k', lw=0.8)
+    ax[0].axvline(0, color='k', lw=0.8)
+    ax[0].set_xlim(-4.5, 4.5)
+    ax[0].set_ylim(0, 4.5)
+    ax[0].grid(True, alpha=0.3)
+    ax[0].set_aspect('equal')
+
+    # Правая часть: Образ конформного отображения K
+    ax[1].set_title("Результат отображения $K$\n($z_2 = (z_1 - i)/(z_1 + i)$, $|z_2| < 1$)")
+    ax[1].axhline(0, color='k', lw=0.8)
+    ax[1].axvline(0, color='k', lw=0.8)
+    # Добавляем границу единичного круга
+    ax[1].add_patch(plt.Circle((0, 0), 1.0, color='red', fill=False, linestyle='--'))
+    ax[1].set_xlim(-1.5, 1.5)
+    ax[1].set_ylim(-1.5, 1.5)
+    ax[1].grid(True, alpha=0.3)
+    ax[1].set_aspect('equal')
+
+    with span("tight_layout"):
+        plt.tight_layout()
+    path = os.path.join(img_dir, "static_mapping2.png")
+    if not streaming:
+        with span("savefig"):
+            plt.savefig(path, dpi=200)
+    else:
+        chunks = iter_cloud_chunks(sample_half_plane, num_pts, lambda z: (mapping(z),), chunk_size or CHUNK_SIZE)
+        save_cloud(fig, ax, chunks, HALF_PLANE_HUE, path, renderer=renderer, dpi=200)
+    print("Картинка 'output/img/static_mapping2.png' сохранена.")
+    plt.close()
+
+
+# =========================================================================
+# 4. АНИМАЦИЯ
+# =========================================================================
+
+def frame_position(frame, Z1, Z2):
+    """Положение сетки в кадре frame: линейная интерполяция между Z1 и Z2."""
+    # В одинарной точности t тоже float32, чтобы не повышать тип сеток
+    t = Z1.real.dtype.type(frame)
+    return (1 - t) * Z1 + t * Z2
+
+
+# Пределы осей анимации (GIF и SVG)
+ANIMATION_XLIM = (-4.5, 4.5)
+ANIMATION_YLIM = (-4.5, 4.5)
+
+
+def build_animation(Z1, Z2, store=None):
+    """
+    Создает фигуру анимации перехода от сетки Z1 к Z2 и функцию update(frame) для нее
+    (см. gif_render.save_animation).
+    store — FrameStore с готовыми положениями сетки во всех кадрах
+    (frame_store.py); без него положения вычисляются в каждом кадре.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(6, 6))
+    # Устанавливаем масштаб, чтобы вместить обе области (H и K)
+    # У Верхней полуплоскости Re от -4 до 4, Im от 0 до 4
+    # У Единичного круга Re от -1 до 1, Im от -1 до 1
+    ax.set_xlim(ANIMATION_XLIM)
+    ax.set_ylim(ANIMATION_YLIM)
+    ax.axhline(0, color='black', linewidth=1)
+    ax.axvline(0, color='black', linewidth=1)
+    ax.grid(True, linestyle='--', alpha=0.4)
+    ax.set_aspect('equal')
+
+    line_plot, = ax.plot([], [], 'b-', lw=1, alpha=0.6)
+    title = ax.set_title("Конформное отображение: Шаг 2 (H $\\to$ K)")
+
+    def update(frame):
+        t = frame  # t меняется от 0 (H) до 1 (K)
+
+        if store is None:
+            Z_curr = frame_position(frame, Z1, Z2)
+            line_plot.set_data(Z_curr.real, Z_curr.imag)
+        else:
+            line_plot.set_data(*store[frame])
+
+        # Обновление заголовка
+        if t < 0.01:
+            title.set_text("Начало: Верхняя полуплоскость $H$")
+        elif t > 0.99:
+            title.set_text("Конец: Единичный круг $K$")
+        else:
+            title.set_text(f"Преобразование Мёбиуса... t={t:.2f}")
+
+        return line_plot, title
+
+    return fig, update
+
+
+# Кадры: 10 пауз в начале, 80 кадров движения, 20 пауз в конце
+frames = np.concatenate([np.zeros(10), np.linspace(0, 1, 80), np.ones(20)])
+# Тот же сценарий для SVG-анимации (svg_render.py): заголовок перехода без t
+SVG_TIMELINE = Timeline([
+    Hold(10, "Начало: Верхняя полуплоскость $H$"),
+    Move(80, "Преобразование Мёбиуса..."),
+    Hold(20, "Конец: Единичный круг $K$"),
+])
+
+
+@profiled()
+def save_report_animation(grid=None, frame_store=None):
+    """
+    Сохраняет анимацию H -> K; grid — (Z1, Z2), по умолчанию get_animation_grid().
+    При frame_store=True (по умолчанию FRAME_STORE) положения сетки во всех
+    кадрах берутся из файла кадров (frame_store.open_frame_store).
+    Возвращает True, если GIF сохранен (ошибка сохранения только выводится).
+    """
+    from tfkp.gif_render import save_animation
+
+    # Создание папок для сохранения, если они не существуют
+    os.makedirs(gif_dir, exist_ok=True)
+    if grid is None:
+        with span("grid"):
+            grid = get_animation_grid()
+    if frame_store is None:
+        frame_store = FRAME_STORE
+    store = open_frame_store("animation2", frame_position, frames, grid) if frame_store else None
+    try:
+        # Сохранение с высокой частотой кадров для плавности
+        save_animation(partial(build_animation, *grid, store=store), frames,
+                       os.path.join(gif_dir, "conformal_animation2.gif"), fps=25, interval=40)
+        print("Анимация 'output/gif/conformal_animation2.gif' сохранена.")
+        return True
+    except Exception as e:
+        print(f"Не удалось сохранить GIF. Убедитесь, что установлены numpy, matplotlib, Pillow: {e}")
+        return False
+
+
+@profiled()
+def save_report_svg(grid=None):
+    """
+    Сохраняет анимацию H -> K векторной SVG (svg_render.py): сетки (Z1, Z2)
+    записываются один раз, а промежуточные кадры рисует браузер.
+    """
+    from tfkp.svg_render import save_svg_animation
+
+    os.makedirs(svg_dir, exist_ok=True)
+    if grid is None:
+        with span("grid"):
+            grid = get_animation_grid()
+    save_svg_animation(os.path.join(svg_dir, "conformal_animation2.svg"), grid, SVG_TIMELINE, 25,
+                       ANIMATION_XLIM, ANIMATION_YLIM)
+    print("Анимация 'conformal_animation2.svg' сохранена.")
+
+
+if __name__ == "__main__":
+    save_static_report_image()
+    save_report_animation()
+    save_report_svg()
\ No newline at end of file
@@ -0,0 +1,247 @@
+import numpy as np
+import os
+from functools import partial
+
+from tfkp.clouds import DISK_HUE, iter_cloud_chunks, sample_disk, save_cloud
+from tfkp.frame_store import FRAME_STORE, open_frame_store
+from tfkp.grids import GRID_TOL, PILOT_SAMPLES, grid_dtype, polar_grid, thin_grid
+from tfkp.mapping_chain import CHUNK_SIZE
+from tfkp.profiling import profiled, span
+from tfkp.timeline import Hold, Move, Timeline
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Пути для сохранения
+img_dir = os.path.join(project_root, "output", "img")
+gif_dir = os.path.join(project_root, "output", "gif")
+svg_dir = os.path.join(project_root, "output", "svg")
+
+def get_grid_points(n_rays=30, n_arcs=10, samples=100, dtype=complex):
+    """
+    Создает сетку точек в Единичном круге K.
+    Используем полярную сетку для красивых линий сетки: n_rays лучей,
+    n_arcs окружностей, по samples точек на линию.
+    dtype — тип точек (complex64 в режиме одинарной точности).
+    """
+
+    rs = np.linspace(0.1, 1.0, n_arcs)  # Радиусы от 0.1 до 1.0
+    thetas = np.linspace(0, 2 * np.pi, n_rays, endpoint=False)  # Углы от 0 до 2pi
+
+    return polar_grid(rs, thetas, 1.0, (0, 2 * np.pi), samples, dtype)
+
+
+# =========================================================================
+# 2. ФУНКЦИЯ ОТОБРАЖЕНИЯ (Шаг 3: K -> G)
+# =========================================================================
+
+def mapping(z2):
+    """
+    Отображение Единичного круга K на Круг G радиуса pi.
+    w = pi * z2 (Гомотетия)
+    """
+    return np.pi * z2
+
+
+def get_animation_grid():
+    """
+    Исходные и конечные точки сетки для анимации: (Z2, W).
+    Плотная сетка прореживается по кривизне линий на обоих этапах
+    (grids.thin_grid); для гомотетии это просто кривизна окружностей K.
+    """
+    Z2 = get_grid_points(samples=PILOT_SAMPLES, dtype=grid_dtype())
+    return thin_grid((Z2, mapping(Z2)), PILOT_SAMPLES, GRID_TOL)
+
+
+# =========================================================================
+# 3. СОХРАНЕНИЕ СТАТИЧЕСКОЙ КАРТИНКИ (для отчета)
+# =========================================================================
+
+@profiled()
+def save_static_report_image(num_pts=10000, chunk_size=None, renderer="scatter", cloud=None):
+    """
+    Генерирует и сохраняет статическое изображение для отчета,
+    сравнивающее исходную и отображенную области.
+    Если задан chunk_size, облако из num_pts точек обрабатывается блоками
+    (потоковый режим, память не зависит от num_pts). renderer='density'
+    рисует облако картинками плотности вместо отдельных точек.
+    cloud — готовое облако (Z2_cloud, W_cloud), например общее для всех
+    картинок (pipeline.py).
+    """
+    import matplotlib.pyplot as plt
+
+    # Создание папок для сохранения, если они не существуют
+    os.makedirs(img_dir, exist_ok=True)
+    streaming = chunk_size is not None or renderer != "scatter"
+    fig, ax = plt.subplots(1, 2, figsize=(12, 5))
+
+    if not streaming:
+        # Генерируем плотное облако точек
+        if cloud is None:
+            with span("sample"):
+                Z2_cloud = sample_disk(num_pts)
+            with span("map"):
+                cloud = (Z2_cloud, mapping(Z2_cloud))
+        Z2_cloud, W_cloud = cloud
+
+        # Раскраска по углу
+        colors = np.angle(Z2_cloud)
+
+        with span("scatter"):
+            ax[0].scatter(Z2_cloud.real, Z2_cloud.imag, c=colors, cmap='hsv', s=1, alpha=0.5)
+            ax[1].scatter(W_cloud.real, W_cloud.imag, c=colors, cmap='hsv', s=1, alpha=0.5)
+
+    # Левая часть: Исходная область K
+    ax[0].set_title("Исходная область $K$\n($|z_2| < 1$)")
+    ax[0].axhline(0, color='k', lw=0.8)
+    ax[0].axvline(0, color='k', lw=0.8)
+    ax[0].add_patch(plt.Circle((0, 0), 1.0, color='red', fill=False, linestyle='--'))
+    ax[0].set_xlim(-1.5, 1.5)
+    ax[0].set_ylim(-1.5, 1.5)
+    ax[0].grid(True, alpha=0.3)
+    ax[0].set_aspect('equal')
+
+    # Правая часть: Образ конформного отображения G
+    ax[1].set_title("Результат отображения $G$\n($w = \\pi z_2$, $|w| < \\pi$)")
+    ax[1].axhline(0, color='k', lw=0.8)
+    ax[1].axvline(0, color='k', lw=0.8)
+    # Добавляем границу целевого круга
+    ax[1].add_patch(plt.Circle((0, 0), np.pi, color='red', fill=False, linestyle='--'))
+    ax[1].set_xlim(-4, 4)
+    ax[1].set_ylim(-4, 4)
+    ax[1].grid(True, alpha=0.3)
+    ax[1].set_aspect('equal')
+
+    with span("tight_layout"):
+        plt.tight_layout()
+    path = os.path.join(img_dir, "static_mapping3.png")
+    if not streaming:
+        with span("savefig"):
+            plt.savefig(path, dpi=200)
+    else:
+        chunks = iter_cloud_chunks(sample_disk, num_pts, lambda z: (mapping(z),), chunk_size or CHUNK_SIZE)
+        save_cloud(fig, ax, chunks, DISK_HUE, path, renderer=renderer, dpi=200)
+    print("Картинка 'output/img/static_mapping3.png' сохранена.")
+    plt.close()
+
+
+# =========================================================================
+# 4. АНИМАЦИЯ
+# =========================================================================
+
+def frame_position(frame, Z2, W):
+    """Положение сетки в кадре frame: линейная интерполяция между Z2 и W."""
+    # В одинарной точности t тоже float32, чтобы не повышать тип сеток
+    t = Z2.real.dtype.type(frame)
+    return (1 - t) * Z2 + t * W
+
+
+# Пределы осей анимации (GIF и SVG)
+ANIMATION_XLIM = (-4, 4)
+ANIMATION_YLIM = (-4, 4)
+
+
+def build_animation(Z2, W, store=None):
+    """
+    Создает фигуру анимации перехода от сетки Z2 к W и функцию update(frame) для нее
+    (см. gif_render.save_animation).
+    store — FrameStore с готовыми положениями сетки во всех кадрах
+    (frame_store.py); без него положения вычисляются в каждом кадре.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(6, 6))
+    # Устанавливаем масштаб, чтобы вместить обе области (K и G)
+    ax.set_xlim(ANIMATION_XLIM)
+    ax.set_ylim(ANIMATION_YLIM)
+    ax.axhline(0, color='black', linewidth=1)
+    ax.axvline(0, color='black', linewidth=1)
+    ax.grid(True, linestyle='--', alpha=0.4)
+    ax.set_aspect('equal')
+
+    line_plot, = ax.plot([], [], 'b-', lw=1, alpha=0.6)
+    title = ax.set_title("Конформное отображение: Шаг 3 (K $\\to$ G)")
+
+    def update(frame):
+        t = frame  # t меняется от 0 (K) до 1 (G)
+
+        if store is None:
+            Z_curr = frame_position(frame, Z2, W)
+            line_plot.set_data(Z_curr.real, Z_curr.imag)
+        else:
+            line_plot.set_data(*store[frame])
+
+        # Обновление заголовка
+        if t < 0.01:
+            title.set_text("Начало: Единичный круг $K$")
+        elif t > 0.99:
+            title.set_text("Конец: Целевой круг $G$ радиуса $\\pi$")
+        else:
+            title.set_text(f"Гомотетия... t={t:.2f}")
+
+        return line_plot, title
+
+    return fig, update
+
+
+# Кадры: 10 пауз в начале, 80 кадров движения, 20 пауз в конце
+frames = np.concatenate([np.zeros(10), np.linspace(0, 1, 80), np.ones(20)])
+# Тот же сценарий для SVG-анимации (svg_render.py): заголовок перехода без t
+SVG_TIMELINE = Timeline([
+    Hold(10, "Начало: Единичный круг $K$"),
+    Move(80, "Гомотетия..."),
+    Hold(20, "Конец: Целевой круг $G$ радиуса $\\pi$"),
+])
+
+
+@profiled()
+def save_report_animation(grid=None, frame_store=None):
+    """
+    Сохраняет анимацию K -> G; grid — (Z2, W), по умолчанию get_animation_grid().
+    При frame_store=True (по умолчанию FRAME_STORE) положения сетки во всех
+    кадрах берутся из файла кадров (frame_store.open_frame_store).
+    Возвращает True, если GIF сохранен (ошибка сохранения только выводится).
+    """
+    from tfkp.gif_render import save_animation
+
+    # Создание папок для сохранения, если они не существуют
+    os.makedirs(gif_dir, exist_ok=True)
+    if grid is None:
+        with span("grid"):
+            grid = get_animation_grid()
+    if frame_store is None:
+        frame_store = FRAME_STORE
+    store = open_frame_store("animation3", frame_position, frames, grid) if frame_store else None
+    try:
+        # Сохранение с высокой частотой кадров для плавности
+        save_animation(partial(build_animation, *grid, store=store), frames,
+                       os.path.join(gif_dir, "conformal_animation3.gif"), fps=25, interval=40)
+        print("Анимация 'output/gif/conformal_animation3.gif' сохранена.")
+        return True
+    except Exception as e:
+        print(f"Не удалось сохранить GIF. Убедитесь, что установлены numpy, matplotlib, Pillow: {e}")
+        return False
+
+
+@profiled()
+def save_report_svg(grid=None):
+    """
+    Сохраняет анимацию K -> G векторной SVG (svg_render.py): сетки (Z2, W)
+    записываются один раз, а промежуточные кадры рисует браузер.
+    """
+    from tfkp.svg_render import save_svg_animation
+
+    os.makedirs(svg_dir, exist_ok=True)
+    if grid is None:
+        with span("grid"):
+            grid = get_animation_grid()
+    save_svg_animation(os.path.join(svg_dir, "conformal_animation3.svg"), grid, SVG_TIMELINE, 25,
+                       ANIMATION_XLIM, ANIMATION_YLIM)
+    print("Анимация 'conformal_animation3.svg' сохранена.")
+
+
+if __name__ == "__main__":
+    save_static_report_image()
+    save_report_animation()
+    save_report_svg()
+
+# plt.show()
\ No newline at end of file
@@ -0,0 +1,108 @@
+import hashlib
+import inspect
+import os
+
+import numpy as np
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Хранить ли положения сетки во всех кадрах анимации в файле (FrameStore)
+# вместо вычисления в каждом кадре. Переменная окружения TFKP_FRAME_STORE=1.
+FRAME_STORE = os.environ.get("TFKP_FRAME_STORE", "0") == "1"
+# Папка файлов кадров (не хранится в git, см. .gitignore)
+FRAME_STORE_DIR = os.path.join(project_root, "output", "frames")
+
+
+# =========================================================================
+# 1. ФАЙЛ КАДРОВ, ОТОБРАЖЕННЫЙ В ПАМЯТЬ
+# =========================================================================
+
+class FrameStore:
+    """
+    Положения сетки во всех различных кадрах анимации в файле .npy
+    формы (кадры, 2, N) float32: строка 0 — x, строка 1 — y.
+
+    Файл открывается через np.load(mmap_mode='r'): store[frame] возвращает
+    представления (x, y) без копирования, страницы читаются с диска по мере
+    надобности и общие для всех процессов, открывших файл. При передаче в
+    другой процесс (pickle) передается только путь, а не данные.
+    """
+
+    def __init__(self, path, frames):
+        self.path = path
+        # Кадры-повторы (паузы) хранятся один раз
+        self.frames = list(dict.fromkeys(frames))
+        self.rows = {frame: row for row, frame in enumerate(self.frames)}
+        self.data = np.load(path, mmap_mode="r")
+        if self.data.shape[0] != len(self.frames):
+            raise ValueError(f"В файле {path!r} {self.data.shape[0]} кадров, ожидается {len(self.frames)}")
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, frame):
+        x, y = self.data[self.rows[frame]]
+        return x, y
+
+    def __reduce__(self):
+        return FrameStore, (self.path, self.frames)
+
+    @classmethod
+    def create(cls, path, position, frames, grid):
+        """
+        Вычисляет position(frame, *grid) (комплексный массив длины N) для
+        каждого различного кадра и записывает в path. Кадры пишутся в файл
+        по одному, так что в памяти одновременно только один кадр; файл
+        появляется под своим именем только целиком (os.replace).
+        """
+        frames = list(dict.fromkeys(frames))
+        size = np.asarray(grid[0]).size
+        tmp = f"{path}.{os.getpid()}.tmp"
+        data = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32,
+                                         shape=(len(frames), 2, size))
+        try:
+            for row, frame in enumerate(frames):
+                z = position(frame, *grid)
+                data[row, 0] = z.real
+                data[row, 1] = z.imag
+            data.flush()
+        finally:
+            del data
+        os.replace(tmp, path)
+        return cls(path, frames)
+
+
+# =========================================================================
+# 2. ПОВТОРНОЕ ИСПОЛЬЗОВАНИЕ МЕЖДУ ЗАПУСКАМИ
+# =========================================================================
+
+def store_key(position, frames, grid, context=""):
+    """
+    Хэш кода position, значений кадров, сеток grid и строки context
+    (например, сценария анимации, от которого зависит position).
+    """
+    h = hashlib.sha256(inspect.getsource(position).encode())
+    h.update(context.encode())
+    h.update(np.asarray(list(dict.fromkeys(frames))).tobytes())
+    for z in grid:
+        z = np.ascontiguousarray(z)
+        h.update(repr((z.dtype.str, z.shape)).encode())
+        h.update(z.tobytes())
+    return h.hexdigest()
+
+
+def open_frame_store(name, position, frames, grid, context="", directory=None):
+    """
+    FrameStore анимации name: открывает готовый файл
+    <directory>/<name>-<ключ>.npy или создает его. Ключ зависит от кода
+    position, кадров, сеток и context, поэтому файл переиспользуется всеми
+    запусками и способами отрисовки (matplotlib, numpy, параллельный), пока
+    они не изменились.
+    """
+    if directory is None:
+        directory = FRAME_STORE_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}-{store_key(position, frames, grid, context)[:16]}.npy")
+    if os.path.exists(path):
+        return FrameStore(path, frames)
+    return FrameStore.create(path, position, frames, grid)
@@ -0,0 +1,302 @@
+import numpy as np
+import os
+from functools import partial
+
+from tfkp.clouds import SECTOR_HUE, iter_cloud_chunks, sample_sector, save_cloud
+from tfkp.frame_store import FRAME_STORE, open_frame_store
+from tfkp.grids import GRID_TOL, PILOT_SAMPLES, grid_dtype, polar_grid, thin_grid
+from tfkp.mapping_chain import CHUNK_SIZE, eval_chain
+from tfkp.profiling import profiled, span
+from tfkp.pullback import save_pullback
+from tfkp.timeline import Hold, Move, Timeline
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Пути для сохранения
+img_dir = os.path.join(project_root, "output", "img")
+gif_dir = os.path.join(project_root, "output", "gif")
+svg_dir = os.path.join(project_root, "output", "svg")
+
+
+# =========================================================================
+# 1. ГЕНЕРАЦИЯ СЕТКИ (для исходной области D)
+# =========================================================================
+
+def get_grid_points(n_rays=30, n_arcs=15, samples=100, dtype=complex):
+    """
+    Создает сетку точек в исходном секторе D: pi/4 < arg(z) < 3pi/4.
+    n_rays радиальных линий, n_arcs дуг, по samples точек на линию.
+    dtype — тип точек (complex64 в режиме одинарной точности).
+    """
+    rs = np.linspace(0.1, 2.0, n_arcs)  # Радиусы от 0.1 до 2.0
+    thetas = np.linspace(np.pi / 4, 3 * np.pi / 4, n_rays)  # Углы от pi/4 до 3pi/4
+    return polar_grid(rs, thetas, 2.0, (np.pi / 4, 3 * np.pi / 4), samples, dtype)
+
+
+# =========================================================================
+# 2. ОТОБРАЖЕНИЕ СЕТКИ D -> H -> K -> G
+# =========================================================================
+
+def get_animation_grid():
+    """
+    Исходные точки и все промежуточные/конечные результаты: (Z, Z1, Z2, W)
+    в D, H, K, G. Функции f1, f2, f3 вынесены в mapping_chain.py;
+    eval_chain считает все три этапа за один проход без промежуточных
+    временных массивов. Плотная сетка прореживается по кривизне линий
+    сразу на всех четырех этапах (grids.thin_grid), так что ломаная точна
+    в каждом кадре анимации.
+    """
+    Z = get_grid_points(samples=PILOT_SAMPLES, dtype=grid_dtype())
+    return thin_grid((Z,) + eval_chain(Z), PILOT_SAMPLES, GRID_TOL)
+
+
+# =========================================================================
+# 3. СОХРАНЕНИЕ СТАТИЧЕСКОЙ КАРТИНКИ (4 этапа в одной фигуре)
+# =========================================================================
+
+def get_cloud_points(num_pts=10000):
+    """Генерирует облако точек в исходном секторе D."""
+    return sample_sector(num_pts)
+
+
+# Оформление четырех панелей схемы
+PANEL_TITLES = [
+    "(a) Область $D$\n($z$-плоскость)",
+    "(b) Область $H$\n($z_1 = -i z^2$)",
+    "(c) Область $K$\n($z_2 = (z_1-i)/(z_1+i)$)",
+    "(d) Область $G$\n($w = \\pi z_2$)"
+]
+PANEL_X_LIMITS = [(-2.5, 2.5), (-4.5, 4.5), (-1.5, 1.5), (-4, 4)]
+PANEL_Y_LIMITS = [(-0.5, 2.5), (-0.5, 4.5), (-1.5, 1.5), (-4, 4)]
+
+
+def setup_panels(ax, titles=None, limits=None, target_radius=np.pi):
+    """
+    Заголовки, пределы, оси координат и границы кругов K и G.
+    titles и limits — по умолчанию схемы варианта 20 (PANEL_TITLES,
+    PANEL_X_LIMITS, PANEL_Y_LIMITS); limits — список (xlim, ylim) панелей,
+    None — пределы по данным. target_radius — радиус круга G
+    (другие варианты задания, sweep.py).
+    """
+    import matplotlib.pyplot as plt
+
+    if titles is None:
+        titles = PANEL_TITLES
+    if limits is None:
+        limits = list(zip(PANEL_X_LIMITS, PANEL_Y_LIMITS))
+    for i in range(4):
+        ax[i].set_title(titles[i])
+        if limits[i] is not None:
+            ax[i].set_xlim(limits[i][0])
+            ax[i].set_ylim(limits[i][1])
+        ax[i].set_aspect('equal')
+        ax[i].axhline(0, color='k', lw=0.8)
+        ax[i].axvline(0, color='k', lw=0.8)
+
+        # Добавляем границы для кругов
+        if i == 2:  # K
+            ax[i].add_patch(plt.Circle((0, 0), 1.0, color='red', fill=False, linestyle='--'))
+        if i == 3:  # G
+            ax[i].add_patch(plt.Circle((0, 0), target_radius, color='red', fill=False, linestyle='--'))
+
+
+@profiled()
+def save_full_static_image(num_pts=10000, chunk_size=None, renderer="scatter", cloud=None):
+    """
+    Сохраняет схему D -> H -> K -> G по облаку из num_pts точек.
+
+    Если задан chunk_size, облако генерируется, отображается и рисуется
+    блоками по chunk_size точек (потоковый режим): память не зависит
+    от num_pts, что позволяет строить картинку по 10^8-10^9 точкам.
+    renderer='density' заменяет точки картинками плотности со средним
+    цветом (density.py): время отрисовки зависит только от разрешения.
+    cloud — готовое облако (Z, Z1, Z2, W), например общее для всех
+    картинок (pipeline.py).
+    """
+    import matplotlib.pyplot as plt
+
+    # Создание папок для сохранения, если они не существуют
+    os.makedirs(img_dir, exist_ok=True)
+    streaming = chunk_size is not None or renderer != "scatter"
+    fig, ax = plt.subplots(1, 4, figsize=(18, 5))
+
+    if not streaming:
+        if cloud is None:
+            with span("sample"):
+                Z_cloud = get_cloud_points(num_pts)
+            with span("map"):
+                cloud = (Z_cloud,) + eval_chain(Z_cloud)
+        clouds = list(cloud)
+        colors = np.angle(clouds[0])
+
+        with span("scatter"):
+            for i in range(4):
+                ax[i].scatter(clouds[i].real, clouds[i].imag, c=colors, cmap='hsv', s=1, alpha=0.5)
+
+    setup_panels(ax)
+
+    with span("tight_layout"):
+        plt.tight_layout()
+    path = os.path.join(img_dir, "full_mapping.png")
+    if not streaming:
+        with span("savefig"):
+            plt.savefig(path, dpi=200)
+    else:
+        chunks = iter_cloud_chunks(sample_sector, num_pts, eval_chain, chunk_size or CHUNK_SIZE)
+        save_cloud(fig, ax, chunks, SECTOR_HUE, path, renderer=renderer, dpi=200)
+    print("Статическое изображение 'output/img/full_mapping.png' сохранено.")
+    plt.close()
+
+
+@profiled()
+def save_full_pullback_image(color_by="arg"):
+    """
+    Сохраняет ту же схему D -> H -> K -> G без облака точек: каждый пиксель
+    панели окрашен по своему прообразу в D (pullback.py), по аргументу
+    (color_by='arg') или модулю (color_by='abs'). Пропусков и шума
+    случайной выборки нет, стоимость пропорциональна числу пикселей.
+    """
+    import matplotlib.pyplot as plt
+
+    # Создание папок для сохранения, если они не существуют
+    os.makedirs(img_dir, exist_ok=True)
+    fig, ax = plt.subplots(1, 4, figsize=(18, 5))
+    setup_panels(ax)
+
+    plt.tight_layout()
+    save_pullback(fig, ax, range(4), os.path.join(img_dir, "full_mapping_pullback.png"),
+                  color_by=color_by, dpi=200)
+    print("Статическое изображение 'output/img/full_mapping_pullback.png' сохранено.")
+    plt.close()
+
+
+# =========================================================================
+# 4. АНИМАЦИЯ D -> H -> K -> G
+# =========================================================================
+
+# Сценарий: паузы на каждой сетке и переходы между ними
+# Сегмент 0: Z -> Z1 (кадры 5-29)
+# Сегмент 1: Z1 -> Z2 (35-59)
+# Сегмент 2: Z2 -> W (65-89)
+TIMELINE = Timeline([
+    Hold(5, "Стадия 1: Исходный сектор $D$"),
+    Move(25, f"Переход $D \\to H$: $z_1 = -i z^2$"),
+    Hold(5, "Стадия 2: Верхняя полуплоскость $H$"),
+    Move(25, r"Переход $H \to K$: $z_2 = \frac{z_1 - i}{z_1 + i}$"),
+    Hold(5, "Стадия 3: Единичный круг $K$"),
+    Move(25, f"Переход $K \\to G$: $w = \\pi z_2$"),
+    Hold(10, "Конец: Целевой круг $G$ радиуса $\\pi$"),
+])
+
+
+def frame_position(frame_index, *positions):
+    """Положение сетки в кадре frame_index по сеткам positions = (Z, Z1, Z2, W)."""
+    return TIMELINE.position(frame_index, positions)
+
+
+# Пределы осей анимации (GIF и SVG)
+ANIMATION_XLIM = (-4.5, 4.5)
+ANIMATION_YLIM = (-4.5, 4.5)
+
+
+def build_animation(Z, Z1, Z2, W, store=None, timeline=None, limits=None):
+    """
+    Создает фигуру анимации по сеткам Z, Z1, Z2, W (D, H, K, G) и функцию
+    update(frame_index) для нее. Вызывается и в основном процессе, и в
+    каждом процессе параллельной отрисовки кадров (gif_render.py).
+    store — FrameStore с готовыми положениями сетки во всех кадрах
+    (frame_store.py); без него положения вычисляются в каждом кадре.
+    timeline и limits = (xlim, ylim) — по умолчанию TIMELINE и
+    ANIMATION_XLIM, ANIMATION_YLIM (другие варианты задания, sweep.py).
+    """
+    import matplotlib.pyplot as plt
+
+    if timeline is None:
+        timeline = TIMELINE
+    if limits is None:
+        limits = (ANIMATION_XLIM, ANIMATION_YLIM)
+    # Определяем "целевые" позиции для анимации
+    positions = [Z, Z1, Z2, W]
+    if len(positions) != timeline.segments + 1:
+        raise ValueError(f"Сценарий рассчитан на {timeline.segments + 1} сеток, получено {len(positions)}")
+
+    fig, ax = plt.subplots(figsize=(7, 7))
+    # Устанавливаем широкий масштаб, чтобы вместить все преобразования,
+    # включая большой круг G (радиус pi ~ 3.14)
+    ax.set_xlim(limits[0])
+    ax.set_ylim(limits[1])
+    ax.axhline(0, color='black', linewidth=1)
+    ax.axvline(0, color='black', linewidth=1)
+    ax.grid(True, linestyle='--', alpha=0.4)
+    ax.set_aspect('equal')
+
+    line_plot, = ax.plot([], [], 'b-', lw=1, alpha=0.6)
+    title = ax.set_title("Конформное отображение: $D \\to H \\to K \\to G$")
+
+    def update(frame_index):
+        if store is None:
+            Z_curr = timeline.position(frame_index, positions)
+            line_plot.set_data(Z_curr.real, Z_curr.imag)
+        else:
+            line_plot.set_data(*store[frame_index])
+        title.set_text(timeline[frame_index][2])
+        return line_plot, title
+
+    return fig, update
+
+
+# Запускаем анимацию на 100 кадров (с паузами и переходами)
+frames = TIMELINE.frames
+
+
+@profiled()
+def save_full_animation(grid=None, frame_store=None):
+    """
+    Сохраняет анимацию D -> H -> K -> G; grid — (Z, Z1, Z2, W), по умолчанию get_animation_grid().
+    При frame_store=True (по умолчанию FRAME_STORE) положения сетки во всех
+    кадрах берутся из файла кадров (frame_store.open_frame_store).
+    Возвращает True, если GIF сохранен (ошибка сохранения только выводится).
+    """
+    from tfkp.gif_render import save_animation
+
+    # Создание папок для сохранения, если они не существуют
+    os.makedirs(gif_dir, exist_ok=True)
+    if grid is None:
+        with span("grid"):
+            grid = get_animation_grid()
+    if frame_store is None:
+        frame_store = FRAME_STORE
+    store = open_frame_store("animation_full", frame_position, frames, grid,
+                             context=repr(TIMELINE)) if frame_store else None
+    try:
+        save_animation(partial(build_animation, *grid, store=store), frames,
+                       os.path.join(gif_dir, "conformal_animation_full.gif"), fps=15, interval=60)
+        print("Анимация 'output/gif/conformal_animation_full.gif' сохранена.")
+        return True
+    except Exception as e:
+        print(f"Не удалось сохранить GIF. Убедитесь, что установлены numpy, matplotlib, Pillow: {e}")
+        return False
+
+
+@profiled()
+def save_full_svg(grid=None):
+    """
+    Сохраняет анимацию D -> H -> K -> G по сценарию TIMELINE векторной SVG
+    (svg_render.py): сетки (Z, Z1, Z2, W) записываются один раз, а
+    промежуточные кадры со сглаживанием шагов рисует браузер.
+    """
+    from tfkp.svg_render import save_svg_animation
+
+    os.makedirs(svg_dir, exist_ok=True)
+    if grid is None:
+        with span("grid"):
+            grid = get_animation_grid()
+    save_svg_animation(os.path.join(svg_dir, "conformal_animation_full.svg"), grid, TIMELINE, 15,
+                       ANIMATION_XLIM, ANIMATION_YLIM)
+    print("Анимация 'output/svg/conformal_animation_full.svg' сохранена.")
+
+
+if __name__ == "__main__":
+    save_full_static_image()
+    save_full_animation()
+    save_full_svg()
\ No newline at end of file
@@ -0,0 +1,688 @@
+import itertools
+import multiprocessing as mp
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+
+import numpy as np
+from matplotlib.animation import AbstractMovieWriter
+from PIL import GifImagePlugin, Image
+
+from tfkp.profiling import span, timed
+
+# Число процессов для отрисовки кадров GIF по умолчанию (1 — последовательно).
+# Можно задать переменной окружения TFKP_ANIMATION_WORKERS.
+ANIMATION_WORKERS = int(os.environ.get("TFKP_ANIMATION_WORKERS", "1"))
+
+# Способ отрисовки кадров: 'matplotlib' (FuncAnimation) или 'numpy'
+# (FastFrameRenderer). Переменная окружения TFKP_ANIMATION_RENDERER.
+ANIMATION_RENDERERS = ("matplotlib", "numpy")
+ANIMATION_RENDERER = os.environ.get("TFKP_ANIMATION_RENDERER", "matplotlib")
+
+# Способ сжатия кадров GIF (см. GifStreamWriter): 'adaptive' — своя палитра
+# у каждого кадра, 'delta' — общая палитра и прозрачность на месте
+# неизменившихся пикселей. Переменная окружения TFKP_GIF_ENCODER.
+GIF_ENCODERS = ("adaptive", "delta")
+GIF_ENCODER = os.environ.get("TFKP_GIF_ENCODER", "delta")
+# Индекс палитры, зарезервированный под прозрачность в режиме 'delta'
+TRANSPARENT_INDEX = 255
+
+
+# =========================================================================
+# 1. ЗАХВАТ КАДРА
+# =========================================================================
+
+def grab_frame(fig, dpi):
+    """
+    Отрисовывает фигуру в кадр Pillow точно так же, как PillowWriter.grab_frame,
+    чтобы GIF совпадал с последовательным путем FuncAnimation.save.
+    """
+    buf = BytesIO()
+    fig.savefig(buf, format="rgba", dpi=dpi)
+    w, h = fig.get_size_inches()
+    size = (int(w * dpi + 1e-8), int(h * dpi + 1e-8))
+    im = Image.frombuffer("RGBA", size, buf.getbuffer(), "raw", "RGBA", 0, 1)
+    if im.getextrema()[3][0] < 255:
+        return im
+    return im.convert("RGB")
+
+
+def figure_dpi(fig, dpi=None):
+    """dpi кадров так же, как в Animation.save: savefig.dpi или dpi фигуры."""
+    import matplotlib as mpl
+
+    if dpi is None:
+        dpi = mpl.rcParams["savefig.dpi"]
+    if dpi == "figure":
+        dpi = fig.dpi
+    return dpi
+
+
+# =========================================================================
+# 2. СХЛОПЫВАНИЕ ПОВТОРЯЮЩИХСЯ КАДРОВ
+# =========================================================================
+
+def frame_state(artists):
+    """
+    Состояние кадра по артистам, которые вернула update: данные ломаных
+    Line2D и тексты Text. Если среди артистов есть другие, состояние
+    неизвестно (None) и кадр всегда считается новым.
+    """
+    from matplotlib.lines import Line2D
+    from matplotlib.text import Text
+
+    state = []
+    for artist in artists:
+        if isinstance(artist, Line2D):
+            xd, yd = artist.get_data()
+            state += [np.asarray(xd, float).tobytes(), np.asarray(yd, float).tobytes()]
+        elif isinstance(artist, Text):
+            state.append(artist.get_text())
+        else:
+            return None
+    return state
+
+
+def schedule_frames(update, frames):
+    """
+    Находит кадры, повторяющие предыдущий (паузы в начале и конце анимации).
+
+    Для каждого кадра вызывается только update(frame), без отрисовки, и
+    сравнивается состояние frame_state с предыдущим кадром. Возвращает
+    (кадры, повторы): список различных подряд кадров и число исходных
+    кадров, которое длится каждый из них. Такой кадр рисуется и сжимается
+    один раз, а в GIF получает длительность repeat / fps, так что время
+    показа не меняется.
+    """
+    unique, repeats = [], []
+    previous = None
+    for frame in frames:
+        state = frame_state(update(frame))
+        if state is not None and state == previous:
+            repeats[-1] += 1
+        else:
+            unique.append(frame)
+            repeats.append(1)
+        previous = state
+    return unique, repeats
+
+
+# =========================================================================
+# 3. ПОТОКОВАЯ ЗАПИСЬ GIF
+# =========================================================================
+
+def build_palette(pixels, exact=128, colors=256):
+    """
+    Палитра GIF (массив colors x 3) по образцу пикселей (..., 3).
+
+    Первые exact цветов — самые частые цвета образца без изменений (фон,
+    оси, сетка, текст остаются точными), остальные — цвета медианного
+    сечения всего образца для оттенков ломаной.
+    """
+    flat = pixels.reshape(-1, 3)
+    unique, counts = np.unique(flat, axis=0, return_counts=True)
+    frequent = unique[np.argsort(counts)[::-1][:exact]]
+    rest = colors - len(frequent)
+    median = Image.fromarray(flat.reshape(-1, 1, 3)).quantize(rest, method=Image.Quantize.MEDIANCUT)
+    extra = np.array(median.getpalette()[:3 * rest], np.uint8).reshape(-1, 3)
+    palette = np.zeros((colors, 3), np.uint8)
+    palette[:len(frequent) + len(extra)] = np.concatenate([frequent, extra])
+    return palette
+
+
+class PaletteQuantizer:
+    """
+    Перевод кадров RGB в индексы общей палитры.
+
+    Ближайший цвет палитры ищется один раз для каждого нового цвета
+    и запоминается в таблице на все 2^24 цветов, так что цвета фона
+    и осей отображаются точно, а повторные кадры почти ничего не стоят.
+    """
+
+    def __init__(self, palette):
+        self.palette = palette
+        # Палитра для Pillow дополняется до 256 цветов
+        padded = np.zeros((256, 3), np.uint8)
+        padded[:len(palette)] = palette
+        self.flat_palette = padded.ravel().tolist()
+        self.lut = np.zeros(1 << 24, np.uint8)
+        self.known = np.zeros(1 << 24, bool)
+
+    def indices(self, rgb):
+        """Кадр uint8 (h, w, 3) -> массив индексов палитры (h, w)."""
+        keys = ((rgb[..., 0].astype(np.int32) << 16) | (rgb[..., 1].astype(np.int32) << 8)
+                | rgb[..., 2])
+        new = np.unique(keys[~self.known[keys]])
+        if new.size:
+            new_rgb = np.stack([new >> 16, (new >> 8) & 255, new & 255], axis=-1)
+            dist = ((new_rgb[:, np.newaxis, :] - self.palette[np.newaxis].astype(np.int32)) ** 2).sum(-1)
+            self.lut[new] = np.argmin(dist, axis=1)
+            self.known[new] = True
+        return self.lut[keys]
+
+    def to_image(self, index):
+        """Массив индексов (h, w) -> изображение Pillow режима P."""
+        h, w = index.shape
+        im = Image.frombytes("P", (w, h), np.ascontiguousarray(index, np.uint8).tobytes())
+        im.putpalette(self.flat_palette)
+        return im
+
+    def __call__(self, rgb):
+        """Кадр uint8 (h, w, 3) -> изображение Pillow режима P."""
+        return self.to_image(self.indices(rgb))
+
+
+class GifStreamWriter:
+    """
+    Запись GIF по кадрам: каждый кадр сжимается и сразу пишется в файл.
+
+    PillowWriter и Image.save(save_all=True) держат в памяти все кадры
+    до конца записи. Здесь хранятся только предыдущий кадр (для поиска
+    изменившейся области) и еще не записанный кадр (одинаковые подряд
+    кадры объединяются в один с суммарной длительностью), поэтому память
+    не зависит от числа кадров. Записывается только прямоугольник,
+    изменившийся относительно предыдущего кадра. Прозрачность исходных
+    кадров не поддерживается: кадры переводятся в RGB.
+
+    encoder='adaptive' — как у Pillow: кадр RGB получает свою адаптивную
+    палитру; кадры режима P пишутся со своей палитрой (если она совпадает
+    с палитрой первого кадра, локальная таблица цветов не нужна).
+
+    encoder='delta' — одна общая палитра на весь файл (palette, массив
+    не более чем из 255 цветов, или build_palette по первому кадру).
+    Внутри изменившегося прямоугольника пиксели, совпадающие с
+    предыдущим кадром, записываются прозрачным цветом поверх него
+    (disposal=1): длинные прозрачные участки сжимаются LZW почти даром,
+    а сравнение идет по индексам палитры, поэтому картинка на экране
+    совпадает с кадром, переведенным в общую палитру.
+
+    Кадры пишутся во временный файл <path>.tmp, который заменяет path
+    только при успешном close (os.replace, как в FrameStore.create): если
+    отрисовка прервалась исключением, прежний файл path остается на месте.
+    """
+
+    def __init__(self, path, fps, encoder="adaptive", palette=None):
+        if encoder not in GIF_ENCODERS:
+            raise ValueError(f"Неизвестный способ сжатия GIF: {encoder!r}, ожидается один из {GIF_ENCODERS}")
+        self.duration = int(1000 / fps)
+        self.encoder = encoder
+        self.palette = palette
+        self.quantize = None
+        self.path = path
+        self.tmp = f"{path}.tmp"
+        self.fp = open(self.tmp, "wb")
+        self.global_palette = None
+        self.previous = None  # предыдущий кадр: массив RGB или индексов палитры
+        self.pending = None   # [кадр P, смещение, длительность, параметры кадра]
+
+    def append(self, im, repeat=1):
+        """Добавляет кадр Pillow длительностью repeat кадров (repeat / fps)."""
+        if self.encoder == "delta":
+            frame = self._delta_frame(im)
+        else:
+            frame = self._adaptive_frame(im)
+        if frame is None:
+            # Кадр не изменился: продлеваем предыдущий
+            self.pending[2] += repeat * self.duration
+            return
+
+        im, offset, params = frame
+        if self.global_palette is None:
+            header, _ = GifImagePlugin.getheader(im, None, {"loop": 0, "duration": self.duration})
+            self.fp.write(b"".join(header))
+            self.global_palette = bytes(im.palette.palette)
+
+        self._flush()
+        self.pending = [im, offset, repeat * self.duration, params]
+
+    @staticmethod
+    def _changed_box(changed):
+        rows, cols = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+        if rows.size == 0:
+            return None
+        return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+    def _adaptive_frame(self, im):
+        if im.mode != "P":
+            im = im.convert("RGB")
+        rgb = np.asarray(im.convert("RGB"))
+
+        if self.previous is None:
+            offset = (0, 0)
+        else:
+            box = self._changed_box(np.any(rgb != self.previous, axis=-1))
+            if box is None:
+                return None
+            offset = box[:2]
+            im = im.crop(box)
+        self.previous = rgb
+
+        if im.mode != "P":
+            im = im.convert("P", palette=Image.Palette.ADAPTIVE)
+        return im, offset, {}
+
+    def _delta_frame(self, im):
+        rgb = np.asarray(im.convert("RGB"))
+        if self.quantize is None:
+            palette = self.palette
+            if palette is None:
+                palette = build_palette(rgb, colors=255)
+            self.quantize = PaletteQuantizer(palette[:TRANSPARENT_INDEX])
+        index = self.quantize.indices(rgb)
+
+        if self.previous is None:
+            offset, params, data = (0, 0), {}, index
+        else:
+            changed = index != self.previous
+            box = self._changed_box(changed)
+            if box is None:
+                return None
+            x0, y0, x1, y1 = box
+            data = np.where(changed[y0:y1, x0:x1], index[y0:y1, x0:x1], TRANSPARENT_INDEX)
+            offset, params = box[:2], {"transparency": TRANSPARENT_INDEX, "disposal": 1}
+        self.previous = index
+        return self.quantize.to_image(data), offset, params
+
+    def _flush(self):
+        if self.pending is None:
+            return
+        im, offset, duration, params = self.pending
+        local = bytes(im.palette.palette) != self.global_palette
+        self.fp.write(b"".join(GifImagePlugin.getdata(im, offset, duration=duration,
+                                                      include_color_table=local, **params)))
+        self.fp.flush()
+        self.pending = None
+
+    def close(self):
+        """Дописывает последний кадр, завершает файл и переносит его в path."""
+        if self.fp is None:
+            return
+        try:
+            self._flush()
+            self.fp.write(b";")
+        except BaseException:
+            self.abort()
+            raise
+        self.fp.close()
+        self.fp = None
+        os.replace(self.tmp, self.path)
+
+    def abort(self):
+        """Прерывает запись: временный файл удаляется, path не меняется."""
+        if self.fp is None:
+            return
+        self.fp.close()
+        self.fp = None
+        os.remove(self.tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class StreamingGifWriter(AbstractMovieWriter):
+    """
+    Замена PillowWriter для Animation.save на основе GifStreamWriter:
+    кадр пишется в файл сразу после отрисовки, а не в конце.
+    repeats — длительности кадров в кадрах анимации (см. schedule_frames),
+    encoder — способ сжатия (см. GifStreamWriter).
+    """
+
+    def __init__(self, *args, repeats=None, encoder="adaptive", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.repeats = repeats
+        self.encoder = encoder
+
+    @classmethod
+    def isAvailable(cls):
+        return True
+
+    def setup(self, fig, outfile, dpi=None):
+        super().setup(fig, outfile, dpi=dpi)
+        self._stream = GifStreamWriter(outfile, self.fps, self.encoder)
+        self._repeats = iter(self.repeats) if self.repeats is not None else None
+
+    def grab_frame(self, **savefig_kwargs):
+        repeat = next(self._repeats) if self._repeats is not None else 1
+        with span("render"):
+            im = grab_frame(self.fig, self.dpi)
+        with span("encode"):
+            self._stream.append(im, repeat)
+
+    @contextmanager
+    def saving(self, fig, outfile, dpi, *args, **kwargs):
+        # finish() вызывается и при исключении в отрисовке кадров: тогда
+        # запись прерывается до него, и close() уже ничего не делает
+        with super().saving(fig, outfile, dpi, *args, **kwargs):
+            try:
+                yield self
+            except BaseException:
+                self._stream.abort()
+                raise
+
+    def finish(self):
+        self._stream.close()
+
+
+# =========================================================================
+# 4. ПАРАЛЛЕЛЬНАЯ ОТРИСОВКА КАДРОВ
+# =========================================================================
+
+# Состояние процесса-исполнителя: своя фигура Agg и функция update
+_worker = {}
+
+
+def _init_worker(build_animation, frames, dpi):
+    fig, update = build_animation()
+    _worker.update(fig=fig, update=update, frames=frames,
+                   dpi=figure_dpi(fig, dpi))
+
+
+def _render_frame(index):
+    _worker["update"](_worker["frames"][index])
+    return grab_frame(_worker["fig"], _worker["dpi"])
+
+
+def render_frames_parallel(build_animation, frames, workers, dpi=None, window=None):
+    """
+    Отрисовывает кадры frames в пуле из workers процессов и выдает
+    кадры Pillow в исходном порядке по мере готовности.
+
+    build_animation() создает фигуру и возвращает (fig, update), где
+    update(frame) — та же функция, что передается в FuncAnimation.
+    Каждый процесс один раз строит свою фигуру и получает только номера
+    кадров. Процессы запускаются через spawn (одинаково на всех ОС):
+    скрипты ничего не делают при импорте, а build_animation передается
+    по ссылке на функцию модуля вместе с сетками.
+
+    В работе одновременно не больше window кадров (по умолчанию
+    2 * workers): следующий кадр отправляется в пул, только когда
+    забирают самый старый. Так готовые кадры не копятся в памяти, если
+    процессы рисуют быстрее, чем GifStreamWriter сжимает, и память не
+    зависит от числа кадров.
+    """
+    if window is None:
+        window = 2 * workers
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(build_animation, frames, dpi)) as pool:
+        pending = deque()
+        indices = iter(range(len(frames)))
+        try:
+            for index in itertools.islice(indices, window):
+                pending.append(pool.submit(_render_frame, index))
+            while pending:
+                im = pending.popleft().result()
+                for index in itertools.islice(indices, 1):
+                    pending.append(pool.submit(_render_frame, index))
+                yield im
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+# =========================================================================
+# 5. БЫСТРЫЙ ПУТЬ: РАСТЕРИЗАЦИЯ ЛОМАНОЙ НА NUMPY
+# =========================================================================
+
+def clip_segments(x0, y0, dx, dy, box):
+    """
+    Отсечение отрезков (x0, y0) + t (dx, dy), 0 <= t <= 1, прямоугольником
+    box = (x0, y0, x1, y1) (Лианг — Барски). Возвращает x0, y0, dx, dy
+    частей отрезков внутри box; отрезки целиком вне box отбрасываются.
+    """
+    bx0, by0, bx1, by1 = box
+    t0, t1 = np.zeros_like(x0), np.ones_like(x0)
+    inside = np.ones(x0.shape, bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in ((-dx, x0 - bx0), (dx, bx1 - x0), (-dy, y0 - by0), (dy, by1 - y0)):
+            # p = 0: отрезок параллелен стороне и целиком по одну сторону от нее
+            inside &= (p != 0) | (q >= 0)
+            r = q / p
+            t0 = np.where(p < 0, np.maximum(t0, r), t0)
+            t1 = np.where(p > 0, np.minimum(t1, r), t1)
+    keep = inside & (t0 <= t1)
+    t0, t1 = t0[keep], t1[keep]
+    dx, dy = dx[keep], dy[keep]
+    return x0[keep] + t0 * dx, y0[keep] + t0 * dy, (t1 - t0) * dx, (t1 - t0) * dy
+
+
+def rasterize_polyline(x, y, shape, width, clip_box=None):
+    """
+    Покрытие (0..1) антиалиасной ломаной на пиксельной сетке shape = (h, w).
+
+    x, y — координаты вершин в пикселях (начало — левый верхний угол);
+    NaN в вершинах разрывают ломаную, как у Line2D. Каждый отрезок
+    разбивается на шаги не длиннее половины пикселя, и вклад шага
+    (длина * width) распределяется билинейно по четырем соседним пикселям.
+    clip_box = (x0, y0, x1, y1) — область осей (по умолчанию вся картинка).
+    Отрезки отсекаются ею до разбиения (clip_segments): около полюса f2
+    вершины уходят на 1e8 пикселей и дальше, и без отсечения один отрезок
+    дал бы сотни миллионов шагов.
+    """
+    h, w = shape
+    if clip_box is None:
+        clip_box = (-1, -1, w + 1, h + 1)
+    finite = np.isfinite(x) & np.isfinite(y)
+    seg = finite[:-1] & finite[1:]
+    x0, y0 = x[:-1][seg], y[:-1][seg]
+    dx, dy = x[1:][seg] - x0, y[1:][seg] - y0
+    x0, y0, dx, dy = clip_segments(x0, y0, dx, dy, clip_box)
+    length = np.hypot(dx, dy)
+
+    steps = np.maximum(np.ceil(2 * length).astype(np.intp), 1)
+    seg_id = np.repeat(np.arange(steps.size), steps)
+    first = np.cumsum(steps) - steps
+    t = (np.arange(seg_id.size) - first[seg_id] + 0.5) / steps[seg_id]
+    px = x0[seg_id] + t * dx[seg_id]
+    py = y0[seg_id] + t * dy[seg_id]
+    weight = (length / steps * width)[seg_id]
+
+    # Точки на границе после отсечения могут выйти за нее на ошибку округления
+    cx0, cy0, cx1, cy1 = clip_box
+    keep = (px >= cx0) & (px <= cx1) & (py >= cy0) & (py <= cy1)
+    px, py, weight = px[keep], py[keep], weight[keep]
+
+    # Билинейное распределение относительно центров пикселей
+    fx, fy = px - 0.5, py - 0.5
+    ix, iy = np.floor(fx).astype(np.intp), np.floor(fy).astype(np.intp)
+    tx, ty = fx - ix, fy - iy
+    acc = np.zeros(h * w)
+    for ox, oy, share in ((0, 0, (1 - tx) * (1 - ty)), (1, 0, tx * (1 - ty)),
+                          (0, 1, (1 - tx) * ty), (1, 1, tx * ty)):
+        cx, cy = ix + ox, iy + oy
+        ok = (cx >= 0) & (cx < w) & (cy >= 0) & (cy < h)
+        acc += np.bincount(cy[ok] * w + cx[ok], weights=(weight * share)[ok], minlength=h * w)
+    return np.minimum(acc, 1.0).reshape(h, w)
+
+
+class FastFrameRenderer:
+    """
+    Рисует кадры анимации без полной отрисовки Matplotlib.
+
+    Статичная часть (оси, сетка, axhline/axvline, подписи) рисуется
+    Matplotlib один раз. Для каждого кадра вызывается та же функция
+    update(frame), что и в FuncAnimation; у возвращенных ею артистов берутся
+    данные ломаной (Line2D) и текст заголовка. Ломаная растеризуется
+    rasterize_polyline, а полоса заголовка рисуется Matplotlib один раз
+    на каждый различный текст и затем берется из кэша.
+    """
+
+    def __init__(self, fig, update, first_frame, dpi):
+        from matplotlib.colors import to_rgb
+        from matplotlib.lines import Line2D
+        from matplotlib.text import Text
+
+        self.fig, self.update = fig, update
+        fig.set_dpi(dpi)
+        artists = update(first_frame)
+        self.lines = [a for a in artists if isinstance(a, Line2D)]
+        self.titles = [a for a in artists if isinstance(a, Text)]
+
+        # Первая отрисовка — с заголовками, чтобы Matplotlib расставил их
+        # положения; вторая — фон без ломаных и с пустыми заголовками
+        # (пустой заголовок не сдвигается)
+        fig.canvas.draw()
+        for line in self.lines:
+            line.set_visible(False)
+        for title in self.titles:
+            title.set_text("")
+        fig.canvas.draw()
+        self.background = np.asarray(fig.canvas.buffer_rgba())[..., :3].astype(np.float32)
+        self.saved = fig.canvas.copy_from_bbox(fig.bbox)
+        self.height, self.width = self.background.shape[:2]
+
+        # Полоса заголовков: все строки выше области осей
+        ax = self.lines[0].axes
+        x0, y0, x1, y1 = ax.bbox.extents
+        self.band = slice(0, max(int(self.height - y1) - 1, 0))
+        self.clip_box = (x0, self.height - y1, x1, self.height - y0)
+        self.title_cache = {}
+
+        self.styles = []
+        for line in self.lines:
+            alpha = line.get_alpha()
+            self.styles.append((np.array(to_rgb(line.get_color()), np.float32) * 255,
+                                1.0 if alpha is None else alpha,
+                                line.get_linewidth() * dpi / 72))
+
+    def _title_band(self, texts):
+        band = self.title_cache.get(texts)
+        if band is None:
+            canvas = self.fig.canvas
+            canvas.restore_region(self.saved)
+            for title, text in zip(self.titles, texts):
+                title.set_text(text)
+                title.axes.draw_artist(title)
+            band = np.asarray(canvas.buffer_rgba())[self.band, :, :3].astype(np.float32)
+            self.title_cache[texts] = band
+        return band
+
+    def render(self, frame):
+        """Кадр frame как массив uint8 формы (h, w, 3)."""
+        self.update(frame)
+        out = self.background.copy()
+        if self.titles:
+            out[self.band] = self._title_band(tuple(t.get_text() for t in self.titles))
+
+        for line, (rgb, alpha, width) in zip(self.lines, self.styles):
+            xd, yd = line.get_data()
+            pts = line.axes.transData.transform(
+                np.column_stack([np.asarray(xd, float), np.asarray(yd, float)]))
+            cov = rasterize_polyline(pts[:, 0], self.height - pts[:, 1],
+                                     (self.height, self.width), width, self.clip_box)
+            a = (alpha * cov).astype(np.float32)[..., np.newaxis]
+            out = out * (1 - a) + rgb * a
+        return np.rint(out).astype(np.uint8)
+
+
+def save_animation_fast(build_animation, frames, path, fps, dpi=None, collapse=True,
+                        encoder="adaptive"):
+    """
+    Сохраняет GIF через FastFrameRenderer: палитра строится один раз по
+    нескольким кадрам, затем каждый кадр переводится в ее индексы без
+    дизеринга и сразу пишется в файл GifStreamWriter. collapse и encoder —
+    как в save_animation.
+    """
+    fig, update = build_animation()
+    update = timed(update, "update")
+    if collapse:
+        with span("schedule"):
+            frames, repeats = schedule_frames(update, frames)
+    else:
+        repeats = [1] * len(frames)
+    renderer = FastFrameRenderer(fig, update, frames[0], figure_dpi(fig, dpi))
+
+    # Общая палитра по первому, среднему и последнему кадрам
+    probe = np.concatenate([renderer.render(frames[i])
+                            for i in sorted({0, len(frames) // 2, len(frames) - 1})])
+
+    if encoder == "delta":
+        # Общую палитру переводит в индексы сам GifStreamWriter
+        with GifStreamWriter(path, fps, encoder, build_palette(probe, colors=255)) as gif:
+            for frame, repeat in zip(frames, repeats):
+                with span("render"):
+                    rgb = renderer.render(frame)
+                with span("encode"):
+                    gif.append(Image.fromarray(rgb), repeat)
+        return
+
+    quantize = PaletteQuantizer(build_palette(probe))
+    with GifStreamWriter(path, fps, encoder) as gif:
+        for frame, repeat in zip(frames, repeats):
+            with span("render"):
+                rgb = renderer.render(frame)
+            with span("encode"):
+                gif.append(quantize(rgb), repeat)
+
+
+# =========================================================================
+# 6. СОХРАНЕНИЕ АНИМАЦИИ
+# =========================================================================
+
+def save_animation(build_animation, frames, path, fps, interval, workers=None, dpi=None,
+                   renderer=None, collapse=True, encoder=None):
+    """
+    Сохраняет GIF-анимацию в path.
+
+    renderer='numpy' — быстрый путь save_animation_fast без полной
+    отрисовки Matplotlib на каждый кадр (для длинных анимаций и перебора
+    параметров). Иначе при workers > 1 кадры рисуются параллельно
+    (render_frames_parallel), а при workers = 1 — обычный путь
+    FuncAnimation. Во всех случаях кадры пишутся в файл по
+    одному (GifStreamWriter), так что память не зависит от числа кадров.
+
+    При collapse=True кадры, повторяющие предыдущий (паузы), не рисуются
+    заново: кадр записывается один раз с большей длительностью
+    (schedule_frames).
+
+    encoder='delta' (по умолчанию GIF_ENCODER) — общая палитра и запись
+    только изменившихся пикселей поверх предыдущего кадра, 'adaptive' —
+    своя палитра у каждого кадра, как у PillowWriter (GifStreamWriter).
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    if workers is None:
+        workers = ANIMATION_WORKERS
+    if renderer is None:
+        renderer = ANIMATION_RENDERER
+    if renderer not in ANIMATION_RENDERERS:
+        raise ValueError(f"Неизвестный способ отрисовки: {renderer!r}, ожидается один из {ANIMATION_RENDERERS}")
+    if encoder is None:
+        encoder = GIF_ENCODER
+    if encoder not in GIF_ENCODERS:
+        raise ValueError(f"Неизвестный способ сжатия GIF: {encoder!r}, ожидается один из {GIF_ENCODERS}")
+    frames = list(frames)
+
+    if renderer == "numpy":
+        save_animation_fast(build_animation, frames, path, fps, dpi, collapse, encoder)
+        return
+
+    fig, update = build_animation()
+    update = timed(update, "update")
+    if collapse:
+        with span("schedule"):
+            frames, repeats = schedule_frames(update, frames)
+    else:
+        repeats = [1] * len(frames)
+
+    if workers > 1:
+        plt.close(fig)
+        with GifStreamWriter(path, fps, encoder) as gif:
+            images = render_frames_parallel(build_animation, frames, workers, dpi)
+            # Кадры рисуются в других процессах: здесь замеряется только сжатие
+            for im, repeat in zip(images, repeats):
+                with span("encode"):
+                    gif.append(im, repeat)
+        return
+
+    ani = FuncAnimation(fig, update, frames=frames, interval=interval, blit=True)
+    ani.save(path, writer=StreamingGifWriter(fps=fps, repeats=repeats, encoder=encoder), dpi=dpi)
@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+
+# Число точек на линию в плотной сетке перед прореживанием thin_grid и
+# допустимое отклонение ломаной от кривой в единицах осей (около четверти
+# пикселя кадров анимаций: оси шириной 8-9 единиц на 600-700 пикселях)
+PILOT_SAMPLES = 1000
+GRID_TOL = 0.003
+
+# Точность сеток анимаций и отображений над ними: 'double' (complex128)
+# или 'single' (complex64 — вдвое меньше памяти; точки, где f2 плохо
+# обусловлено, пересчитываются в двойной точности, см.
+# mapping_chain.promote_near_pole). Переменная окружения TFKP_PRECISION.
+PRECISIONS = {"double": np.complex128, "single": np.complex64}
+PRECISION = os.environ.get("TFKP_PRECISION", "double")
+
+
+def grid_dtype(precision=None):
+    """Тип комплексных чисел сеток для точности precision (по умолчанию PRECISION)."""
+    if precision is None:
+        precision = PRECISION
+    if precision not in PRECISIONS:
+        raise ValueError(f"Неизвестная точность: {precision!r}, ожидается одна из {tuple(PRECISIONS)}")
+    return PRECISIONS[precision]
+
+
+# =========================================================================
+# 1. СЕТКИ ЛИНИЙ ДЛЯ АНИМАЦИЙ
+# =========================================================================
+
+# Все сетки возвращаются одним одномерным комплексным массивом: линии
+# идут подряд, после каждой стоит NaN, чтобы Line2D не соединял линии.
+# Массив выделяется один раз, и точки линий записываются прямо в него
+# (без списков Python), поэтому сетки из миллионов линий строятся быстро.
+
+def line_buffer(n_lines, samples, dtype=complex):
+    """
+    Буфер формы (n_lines, samples + 1) типа dtype для линий по samples
+    точек; последний столбец заполнен разделителями NaN.
+    """
+    out = np.empty((n_lines, samples + 1), dtype=dtype)
+    out[:, samples] = np.nan + 1j * np.nan
+    return out
+
+
+def polar_grid(radii, thetas, r_max, arc_range, samples=100, dtype=complex):
+    """
+    Полярная сетка: лучи z = r * exp(i * theta), r от 0 до r_max, для
+    каждого theta из thetas, затем дуги z = r * exp(i * t), t в пределах
+    arc_range, для каждого r из radii. По samples точек на линию.
+    Точки считаются в двойной точности и записываются в массив типа dtype.
+    """
+    radii, thetas = np.asarray(radii), np.asarray(thetas)
+    out = line_buffer(len(thetas) + len(radii), samples, dtype)
+    rays, arcs = out[:len(thetas), :samples], out[len(thetas):, :samples]
+
+    np.multiply(np.linspace(0, r_max, samples), np.exp(1j * thetas)[:, np.newaxis], out=rays)
+    np.multiply(radii[:, np.newaxis], np.exp(1j * np.linspace(*arc_range, samples)), out=arcs)
+    return out.reshape(-1)
+
+
+def rect_grid(reals, imags, re_range, im_range, samples=100, dtype=complex):
+    """
+    Прямоугольная сетка: вертикальные линии Re z = x, Im z в пределах
+    im_range, для каждого x из reals, затем горизонтальные линии Im z = y,
+    Re z в пределах re_range, для каждого y из imags. По samples точек
+    на линию. Точки считаются в двойной точности и записываются в массив
+    типа dtype.
+    """
+    reals, imags = np.asarray(reals), np.asarray(imags)
+    out = line_buffer(len(reals) + len(imags), samples, dtype)
+    vertical, horizontal = out[:len(reals), :samples], out[len(reals):, :samples]
+
+    np.add(reals[:, np.newaxis], 1j * np.linspace(*im_range, samples), out=vertical)
+    np.add(np.linspace(*re_range, samples), 1j * imags[:, np.newaxis], out=horizontal)
+    return out.reshape(-1)
+
+
+# =========================================================================
+# 2. ПРОРЕЖИВАНИЕ СЕТКИ ПО КРИВИЗНЕ ОБРАЗОВ
+# =========================================================================
+
+def thin_grid(stages, samples, tol, max_step=None):
+    """
+    Прореживает плотную сетку так, чтобы ломаные на всех этапах отличались
+    от точных кривых не более чем на tol (в единицах осей).
+
+    stages — одна и та же сетка (polar_grid/rect_grid с samples точками
+    на линию) в плоскостях нескольких этапов, например (Z, f1(Z)).
+    Хорда между соседними оставленными точками отклоняется от кривой
+    P(u) примерно на h^2 |P''| / 8, где h — шаг параметра. Поэтому на
+    каждом интервале плотной выборки нужно sqrt(|P''| h^2 / (8 tol))
+    точек (берется наибольшее по этапам); точки оставляются там, где
+    накопленная потребность переходит через целое. Ошибка считается
+    по параметру, поэтому она ограничена и для промежуточных кадров
+    анимации (1 - t) * P0 + t * P1. max_step дополнительно ограничивает
+    длину звена ломаной на каждом этапе.
+
+    Возвращает кортеж прореженных массивов этапов с разделителями NaN.
+    """
+    n_lines = stages[0].size // (samples + 1)
+    need = np.zeros((n_lines, samples - 1))
+    for points in stages:
+        p = points.reshape(n_lines, samples + 1)[:, :samples]
+        d2 = np.zeros((n_lines, samples))
+        d2[:, 1:-1] = np.abs(p[:, 2:] - 2 * p[:, 1:-1] + p[:, :-2])
+        stage_need = np.sqrt(np.maximum(d2[:, :-1], d2[:, 1:]) / (8 * tol))
+        if max_step is not None:
+            stage_need = np.maximum(stage_need, np.abs(np.diff(p, axis=1)) / max_step)
+        # Около полюса образы бесконечны: такие точки оставляются все
+        stage_need[~np.isfinite(stage_need)] = 1.0
+        np.maximum(need, stage_need, out=need)
+
+    total = np.floor(np.cumsum(need, axis=1))
+    keep = np.ones((n_lines, samples + 1), dtype=bool)
+    keep[:, 1:samples] = np.diff(total, axis=1, prepend=0) > 0
+    keep[:, samples - 1] = True
+    keep = keep.reshape(-1)
+    return tuple(points[keep] for points in stages)
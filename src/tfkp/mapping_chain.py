@@ -0,0 +1,195 @@
+import numpy as np
+
+# Размер блока (в точках) для потоковой обработки.
+# 64K точек complex128 = 1 МБ на буфер: блок и временные массивы
+# помещаются в кэш процессора.
+CHUNK_SIZE = 1 << 16
+
+# Одинарная точность (complex64): машинное эпсилон и допустимая ошибка
+# z2 = f2(z1) в единицах плоскости K (много меньше пикселя). Точки, где
+# оценка ошибки больше, пересчитываются в двойной точности.
+EPS_SINGLE = float(np.finfo(np.float32).eps)
+PROMOTE_TOL = 1e-5
+
+
+# =========================================================================
+# 1. ФУНКЦИИ ОТОБРАЖЕНИЯ И ОБРАТНЫЕ К НИМ
+# =========================================================================
+
+def f1(z):
+    # D -> H: z1 = -i * z^2
+    return -1j * (z ** 2)
+
+
+def f2(z1):
+    # H -> K: z2 = (z1 - i) / (z1 + i)
+    return (z1 - 1j) / (z1 + 1j)
+
+
+def f3(z2):
+    # K -> G: w = pi * z2
+    return np.pi * z2
+
+
+# Обратные отображения. Ветвь корня в f1_inv выбрана так, чтобы
+# верхняя полуплоскость H переходила именно в сектор D.
+
+def f1_inv(z1):
+    # H -> D: z = i * sqrt(-i * z1), главная ветвь sqrt
+    return 1j * np.sqrt(-1j * z1)
+
+
+def f2_inv(z2):
+    # K -> H: z1 = i * (1 + z2) / (1 - z2)
+    return 1j * (1 + z2) / (1 - z2)
+
+
+def f3_inv(w):
+    # G -> K: z2 = w / pi
+    return w / np.pi
+
+
+def f2_error_bound(z1):
+    """
+    Оценка абсолютной ошибки z2 = f2(z1) в одинарной точности.
+
+    Относительная ошибка z1 порядка eps переходит в ошибку z2 порядка
+    |f2'(z1)| |z1| eps = 2 |z1| eps / |z1 + i|^2: около полюса z1 = -i
+    она неограниченно растет. Множитель 4 учитывает несколько округлений.
+    """
+    z1 = np.asarray(z1)
+    return 4 * EPS_SINGLE * (1 + 2 * np.abs(z1) / np.abs(z1 + 1j) ** 2)
+
+
+def promote_near_pole(z1, z2, recompute_z1=None, tol=PROMOTE_TOL):
+    """
+    В массиве z2 = f2(z1) одинарной точности пересчитывает в двойной
+    точности только точки, где f2_error_bound(z1) > tol (около z1 = -i),
+    и записывает их округленными обратно в z2.
+
+    recompute_z1(mask) — z1 в этих точках, вычисленное в двойной точности
+    из исходных данных (например, f1(z[mask]) от complex128); тогда
+    уточненные значения записываются и в z1. По умолчанию берется сам z1.
+    Возвращает маску пересчитанных точек.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mask = f2_error_bound(z1) > tol
+    if mask.any():
+        if recompute_z1 is None:
+            exact = z1[mask].astype(np.complex128)
+        else:
+            exact = recompute_z1(mask)
+            z1[mask] = exact
+        z2[mask] = f2(exact)
+    return mask
+
+
+def precision_error(z, results, stages=(1, 2, 3)):
+    """
+    Наибольшая ошибка результатов eval_chain(z, stages), посчитанных в
+    одинарной точности, относительно двойной точности (по каждому этапу).
+    Ошибка делится на max(1, |точное значение|): далеко от начала
+    координат неустранимо округление самого complex64. Для проверки
+    режима TFKP_PRECISION=single.
+    """
+    exact = eval_chain(np.asarray(z).astype(np.complex128), stages)
+    return tuple(float(np.nanmax(np.abs(r - e) / np.maximum(1, np.abs(e))))
+                 for r, e in zip(results, exact))
+
+
+def pull_back(w, stage):
+    """
+    Прообраз в z-плоскости (область D) точек этапа stage:
+    0 — сама z-плоскость, 1 — H, 2 — K, 3 — G.
+
+    Обратные отображения берутся из transforms.stage_map: f2_inv и f3_inv
+    там перемножены в одно дробно-линейное отображение, так что G -> D —
+    одно деление и один корень.
+    """
+    from tfkp.transforms import stage_map
+
+    return stage_map(stage, 0)(w)
+
+
+# =========================================================================
+# 2. СЛИТНОЕ ВЫЧИСЛЕНИЕ ЦЕПОЧКИ f1 -> f2 -> f3
+# =========================================================================
+
+def eval_chain(z, stages=(1, 2, 3), out=None, chunk_size=CHUNK_SIZE, backend=None, threads=None):
+    """
+    Вычисляет цепочку D -> H -> K -> G за один проход по блокам массива z.
+
+    stages — номера этапов, которые нужно вернуть: 1 (Z1, область H),
+    2 (Z2, область K), 3 (W, область G).
+    out — необязательный список буферов для результатов (в порядке stages,
+    None — выделить новый). Буферы должны быть C-непрерывными и иметь
+    форму z.
+
+    Все операции выполняются "на месте" внутри блоков, поэтому кроме
+    выходных массивов используется лишь несколько буферов размера
+    chunk_size. Результат побитово совпадает с f1(z), f2(f1(z)),
+    f3(f2(f1(z))). Для complex64 точки около полюса f2 пересчитываются
+    в двойной точности (promote_near_pole). backend и threads — способ обхода блоков
+    (backend.run_ranges): при backend='threads' диапазоны блоков
+    считаются параллельно в пуле потоков, каждый со своими буферами.
+    """
+    from tfkp.backend import run_ranges
+
+    z = np.asarray(z)
+    dtype = np.result_type(z.dtype, np.complex64)
+    if out is None:
+        out = [None] * len(stages)
+    if len(out) != len(stages):
+        raise ValueError("Число буферов out должно совпадать с числом этапов")
+
+    results = []
+    targets = {}
+    for stage, buf in zip(stages, out):
+        if stage not in (1, 2, 3):
+            raise ValueError(f"Неизвестный этап: {stage}")
+        if buf is None:
+            buf = np.empty(z.shape, dtype=dtype)
+        elif buf.shape != z.shape or not buf.flags.c_contiguous:
+            raise ValueError("Буфер out должен быть C-непрерывным и иметь форму z")
+        results.append(buf)
+        targets[stage] = buf.reshape(-1)
+
+    last = max(stages)
+    flat = z.reshape(-1)
+    size = flat.size
+    n = min(chunk_size, size)
+
+    def body(begin, end):
+        # Временные буферы для этапов, которые не нужно возвращать,
+        # и для знаменателя дроби f2
+        scratch_z1 = None if 1 in targets else np.empty(n, dtype=dtype)
+        scratch_z2 = None if (2 in targets or last < 2) else np.empty(n, dtype=dtype)
+        den = np.empty(n, dtype=dtype) if last >= 2 else None
+
+        for start in range(begin, end, n or 1):
+            stop = min(start + n, end)
+            m = stop - start
+            src = flat[start:stop]
+
+            # f1: z1 = -i * z^2
+            z1 = targets[1][start:stop] if 1 in targets else scratch_z1[:m]
+            np.square(src, out=z1)
+            np.multiply(-1j, z1, out=z1)
+            if last < 2:
+                continue
+
+            # f2: z2 = (z1 - i) / (z1 + i)
+            z2 = targets[2][start:stop] if 2 in targets else scratch_z2[:m]
+            np.add(z1, 1j, out=den[:m])
+            np.subtract(z1, 1j, out=z2)
+            np.divide(z2, den[:m], out=z2)
+            if dtype == np.complex64:
+                promote_near_pole(z1, z2, lambda mask: f1(src[mask].astype(np.complex128)))
+            if last < 3:
+                continue
+
+            # f3: w = pi * z2
+            np.multiply(np.pi, z2, out=targets[3][start:stop])
+
+    run_ranges(body, size, n or 1, backend, threads)
+    return tuple(results)
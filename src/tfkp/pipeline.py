@@ -0,0 +1,384 @@
+import hashlib
+import inspect
+import json
+import os
+
+from tfkp import (clouds, conformal_mapping1, conformal_mapping2, conformal_mapping3, density,
+                  frame_store, full_mapping, gif_render, grids, mapping_chain, svg_render,
+                  timeline, transforms)
+from tfkp.clouds import sample_disk, sample_half_plane, sample_sector
+from tfkp.grids import GRID_TOL, PILOT_SAMPLES, grid_dtype, thin_grid
+from tfkp.mapping_chain import eval_chain
+from tfkp.profiling import span
+
+
+# =========================================================================
+# 1. ГРАФ ЭТАПОВ
+# =========================================================================
+
+class BuildError(RuntimeError):
+    """Узел не сохранил свой файл."""
+
+
+class Node:
+    """
+    Узел графа: func(*результаты deps, **params). modules — модули, от
+    исходного кода которых зависит результат; output — путь файла (от
+    корня проекта), который узел сохраняет.
+    """
+
+    def __init__(self, name, func, deps, modules, output, params):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.modules = tuple(modules)
+        self.output = output
+        self.params = dict(params)
+
+
+class Pipeline:
+    """
+    Граф вычислений без циклов (DAG): каждый узел — функция от результатов
+    узлов-зависимостей и своих параметров.
+
+    Ключ узла — хэш исходного кода его функции и модулей modules,
+    параметров, ключей зависимостей и строки environment (версии
+    библиотек и настройки отрисовки). run() вычисляет каждый узел не
+    больше одного раза и запоминает результат; при следующем запуске
+    пересчитываются только узлы, ключ которых изменился (например, после
+    set_params), и узлы, зависящие от них. С кэшем OutputCache узлы-файлы
+    с неизменным ключом не пересчитываются и между запусками.
+    """
+
+    def __init__(self, environment=""):
+        self.environment = environment
+        self.nodes = {}
+        self.results = {}  # имя -> (ключ, результат)
+
+    def add(self, name, func, deps=(), modules=(), output=None, **params):
+        """Добавляет узел; зависимости должны быть добавлены раньше."""
+        if name in self.nodes:
+            raise ValueError(f"Узел {name!r} уже есть в графе")
+        for dep in deps:
+            if dep not in self.nodes:
+                raise ValueError(f"Неизвестная зависимость {dep!r} узла {name!r}")
+        self.nodes[name] = Node(name, func, deps, modules, output, params)
+
+    def set_params(self, name, **params):
+        """Меняет параметры узла: он и его потомки пересчитаются при run()."""
+        self.nodes[name].params.update(params)
+
+    def key(self, name, dep_keys):
+        node = self.nodes[name]
+        h = hashlib.sha256(self.environment.encode())
+        h.update(inspect.getsource(node.func).encode())
+        for module in node.modules:
+            h.update(inspect.getsource(module).encode())
+        h.update(repr(sorted(node.params.items())).encode())
+        for dep in node.deps:
+            h.update(dep_keys[dep].encode())
+        return h.hexdigest()
+
+    def order(self, targets):
+        """Узлы, нужные для targets, в порядке вычисления (зависимости раньше)."""
+        order, seen = [], set()
+
+        def visit(name):
+            if name in seen:
+                return
+            seen.add(name)
+            for dep in self.nodes[name].deps:
+                visit(dep)
+            order.append(name)
+
+        for name in targets:
+            visit(name)
+        return order
+
+    def run(self, targets=None, cache=None, force=False):
+        """
+        Вычисляет узлы targets (по умолчанию все) и их зависимости.
+        Возвращает словарь имя -> результат для targets.
+
+        Ключи зависят только от ключей зависимостей, а не от результатов,
+        поэтому они считаются заранее: узлы-файлы, актуальные по кэшу
+        cache, пропускаются вместе со всеми узлами, нужными только им
+        (результат такого узла — путь к файлу). При force=True
+        пересчитываются все узлы targets, но кэш все равно обновляется.
+        Файл попадает в кэш, только если узел завершился без исключения.
+        """
+        if targets is None:
+            targets = list(self.nodes)
+        keys = {}
+        for name in self.order(targets):
+            keys[name] = self.key(name, keys)
+
+        todo = []
+        for name in targets:
+            output = self.nodes[name].output
+            if not force and cache is not None and output is not None and cache.fresh(output, keys[name]):
+                print(f"Файл '{output}' не изменился, пропущен.")
+            else:
+                todo.append(name)
+
+        for name in self.order(todo):
+            cached = self.results.get(name)
+            if cached is not None and cached[0] == keys[name]:
+                continue
+            node = self.nodes[name]
+            with span(name):
+                value = node.func(*(self.results[dep][1] for dep in node.deps), **node.params)
+            self.results[name] = (keys[name], value)
+            if cache is not None and node.output is not None:
+                cache.record(node.output, keys[name])
+        return {name: self.results[name][1] if name in todo else self.nodes[name].output
+                for name in targets}
+
+
+# =========================================================================
+# 2. КЭШ ИТОГОВЫХ ФАЙЛОВ
+# =========================================================================
+
+class OutputCache:
+    """
+    Манифест готовых файлов (по умолчанию output/manifest.json): для
+    каждого файла — ключ узла, из которого он получен, и sha256 его
+    содержимого. Файл считается актуальным, если ключ совпадает, а файл
+    существует и не был изменен после записи. Манифест сохраняется после
+    каждого файла, так что прерванная сборка не теряет готовые файлы.
+    """
+
+    def __init__(self, root, path=os.path.join("output", "manifest.json")):
+        self.root = root
+        self.path = os.path.join(root, path)
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as fp:
+                self.entries = json.load(fp)
+
+    def _digest(self, output):
+        h = hashlib.sha256()
+        with open(os.path.join(self.root, output), "rb") as fp:
+            for block in iter(lambda: fp.read(1 << 20), b""):
+                h.update(block)
+        return h.hexdigest()
+
+    def fresh(self, output, key):
+        entry = self.entries.get(output)
+        return (entry is not None and entry["key"] == key
+                and os.path.exists(os.path.join(self.root, output))
+                and entry["sha256"] == self._digest(output))
+
+    def record(self, output, key):
+        """
+        Запоминает файл output, успешно записанный узлом с ключом key
+        (узел, не сохранивший файл, завершается исключением BuildError).
+        """
+        self.entries[output] = {"key": key, "sha256": self._digest(output)}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as fp:
+            json.dump(self.entries, fp, indent=2, sort_keys=True)
+
+
+def environment():
+    """
+    Все, что влияет на файлы помимо кода и параметров: версии библиотек,
+    способы отрисовки и сжатия GIF и выборка облаков (переменные
+    окружения TFKP_*).
+    """
+    import matplotlib
+    import numpy
+    import PIL
+
+    return repr((numpy.__version__, matplotlib.__version__, PIL.__version__,
+                 gif_render.ANIMATION_RENDERER, gif_render.GIF_ENCODER,
+                 frame_store.FRAME_STORE, clouds.CLOUD_SAMPLER, clouds.CLOUD_SEED,
+                 grids.PRECISION))
+
+
+# =========================================================================
+# 3. УЗЛЫ: СЕТКИ, ОБЛАКА И ИТОГОВЫЕ ФАЙЛЫ
+# =========================================================================
+
+# Плотные сетки и их образы на всех нужных этапах считаются один раз;
+# сетки анимаций получаются из них прореживанием (grids.thin_grid).
+
+def sector_grid(samples):
+    """Плотная сетка сектора D и ее образы в H, K, G."""
+    Z = full_mapping.get_grid_points(samples=samples, dtype=grid_dtype())
+    return (Z,) + eval_chain(Z)
+
+
+def half_plane_grid(samples):
+    """Плотная прямоугольная сетка H и ее образ в K."""
+    Z1 = conformal_mapping2.get_grid_points(samples=samples, dtype=grid_dtype())
+    return Z1, conformal_mapping2.mapping(Z1)
+
+
+def disk_grid(samples):
+    """Плотная полярная сетка K и ее образ в G."""
+    Z2 = conformal_mapping3.get_grid_points(samples=samples, dtype=grid_dtype())
+    return Z2, conformal_mapping3.mapping(Z2)
+
+
+def thinned(grid, samples, tol, stages=None):
+    """Сетка grid (первые stages этапов), прореженная по кривизне."""
+    return thin_grid(grid[:stages], samples, tol)
+
+
+# Облака точек для статических картинок: облако сектора D с образами
+# на всех этапах общее для схемы full_mapping.png и картинки D -> H.
+
+def sector_cloud(num_pts):
+    z = sample_sector(num_pts)
+    return (z,) + eval_chain(z)
+
+
+def half_plane_cloud(num_pts):
+    z1 = sample_half_plane(num_pts)
+    return z1, conformal_mapping2.mapping(z1)
+
+
+def disk_cloud(num_pts):
+    z2 = sample_disk(num_pts)
+    return z2, conformal_mapping3.mapping(z2)
+
+
+def full_image(cloud):
+    full_mapping.save_full_static_image(cloud=cloud)
+    return "output/img/full_mapping.png"
+
+
+def static_image1(cloud):
+    conformal_mapping1.save_static_report_image(cloud=cloud[:2])
+    return "output/img/static_mapping1.png"
+
+
+def static_image2(cloud):
+    conformal_mapping2.save_static_report_image(cloud=cloud)
+    return "output/img/static_mapping2.png"
+
+
+def static_image3(cloud):
+    conformal_mapping3.save_static_report_image(cloud=cloud)
+    return "output/img/static_mapping3.png"
+
+
+def saved(ok, output):
+    """
+    Путь output, если сохранение удалось. Скрипты перехватывают ошибки
+    записи GIF и только сообщают о них, поэтому неудача — исключение
+    BuildError: файл не попадает в манифест и пересобирается при
+    следующем запуске.
+    """
+    if not ok:
+        raise BuildError(f"Файл '{output}' не сохранен")
+    return output
+
+
+def full_animation(grid):
+    return saved(full_mapping.save_full_animation(grid), "output/gif/conformal_animation_full.gif")
+
+
+def animation1(grid):
+    return saved(conformal_mapping1.save_report_animation(grid), "output/gif/conformal_animation1.gif")
+
+
+def animation2(grid):
+    return saved(conformal_mapping2.save_report_animation(grid), "output/gif/conformal_animation2.gif")
+
+
+def animation3(grid):
+    return saved(conformal_mapping3.save_report_animation(grid), "output/gif/conformal_animation3.gif")
+
+
+def full_svg(grid):
+    full_mapping.save_full_svg(grid)
+    return "output/svg/conformal_animation_full.svg"
+
+
+def svg1(grid):
+    conformal_mapping1.save_report_svg(grid)
+    return "output/svg/conformal_animation1.svg"
+
+
+def svg2(grid):
+    conformal_mapping2.save_report_svg(grid)
+    return "output/svg/conformal_animation2.svg"
+
+
+def svg3(grid):
+    conformal_mapping3.save_report_svg(grid)
+    return "output/svg/conformal_animation3.svg"
+
+
+# Итоговые файлы (узлы без потомков)
+ARTIFACTS = ("full_mapping.png", "static_mapping1.png", "static_mapping2.png",
+             "static_mapping3.png", "conformal_animation_full.gif",
+             "conformal_animation1.gif", "conformal_animation2.gif",
+             "conformal_animation3.gif", "conformal_animation_full.svg",
+             "conformal_animation1.svg", "conformal_animation2.svg",
+             "conformal_animation3.svg")
+
+
+# Общие модули, от кода которых зависят все файлы: отображения, сетки,
+# облака и их отрисовка, запись GIF и SVG и файлы кадров
+COMMON_MODULES = (mapping_chain, transforms, grids, clouds, density, gif_render, svg_render,
+                  frame_store, timeline)
+
+
+def build_pipeline(num_pts=10000, samples=PILOT_SAMPLES, tol=GRID_TOL):
+    """
+    Граф всех файлов output/ (ARTIFACTS) с общими сетками и облаками.
+    Ключ файла включает параметры сеток и облаков, код скрипта (оформление
+    фигуры, кадры и fps анимации), код общих модулей и environment().
+    """
+    p = Pipeline(environment())
+    p.add("sector_grid", sector_grid, samples=samples)
+    p.add("half_plane_grid", half_plane_grid, samples=samples)
+    p.add("disk_grid", disk_grid, samples=samples)
+    p.add("grid_full", thinned, ["sector_grid"], samples=samples, tol=tol)
+    p.add("grid1", thinned, ["sector_grid"], samples=samples, tol=tol, stages=2)
+    p.add("grid2", thinned, ["half_plane_grid"], samples=samples, tol=tol)
+    p.add("grid3", thinned, ["disk_grid"], samples=samples, tol=tol)
+
+    p.add("sector_cloud", sector_cloud, num_pts=num_pts)
+    p.add("half_plane_cloud", half_plane_cloud, num_pts=num_pts)
+    p.add("disk_cloud", disk_cloud, num_pts=num_pts)
+
+    for name, func, dep, script in (
+            ("full_mapping.png", full_image, "sector_cloud", full_mapping),
+            ("static_mapping1.png", static_image1, "sector_cloud", conformal_mapping1),
+            ("static_mapping2.png", static_image2, "half_plane_cloud", conformal_mapping2),
+            ("static_mapping3.png", static_image3, "disk_cloud", conformal_mapping3),
+            ("conformal_animation_full.gif", full_animation, "grid_full", full_mapping),
+            ("conformal_animation1.gif", animation1, "grid1", conformal_mapping1),
+            ("conformal_animation2.gif", animation2, "grid2", conformal_mapping2),
+            ("conformal_animation3.gif", animation3, "grid3", conformal_mapping3),
+            ("conformal_animation_full.svg", full_svg, "grid_full", full_mapping),
+            ("conformal_animation1.svg", svg1, "grid1", conformal_mapping1),
+            ("conformal_animation2.svg", svg2, "grid2", conformal_mapping2),
+            ("conformal_animation3.svg", svg3, "grid3", conformal_mapping3)):
+        folder = {".png": "img", ".gif": "gif", ".svg": "svg"}[os.path.splitext(name)[1]]
+        p.add(name, func, [dep], modules=(script,) + COMMON_MODULES,
+              output=os.path.join("output", folder, name))
+    return p
+
+
+def build_all(force=False, targets=None):
+    """
+    Собирает файлы targets (по умолчанию все ARTIFACTS) в output/,
+    пропуская актуальные по манифесту output/manifest.json
+    (force=True — пересобрать и их). Манифест обновляется в обоих случаях.
+    """
+    if targets is None:
+        targets = ARTIFACTS
+    unknown = [name for name in targets if name not in ARTIFACTS]
+    if unknown:
+        raise ValueError(f"Неизвестные файлы: {unknown}, ожидаются из {ARTIFACTS}")
+    cache = OutputCache(full_mapping.project_root)
+    return build_pipeline().run(list(targets), cache=cache, force=force)
+
+
+if __name__ == "__main__":
+    build_all()
@@ -0,0 +1,353 @@
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from tfkp.sweep import VARIANT_DEFAULTS, VARIANT_TIMELINE, animation_limits, variant_grid, variant_params
+from tfkp.timeline import Timeline
+
+# Число процессов отрисовки кадров; переменная окружения TFKP_PREVIEW_WORKERS
+PREVIEW_WORKERS = int(os.environ.get("TFKP_PREVIEW_WORKERS", str(os.cpu_count() or 1)))
+# Сколько сеток и готовых картинок (PNG) держать в памяти; переменная
+# окружения TFKP_PREVIEW_CACHE — число картинок
+PREVIEW_GRIDS = 32
+PREVIEW_CACHE = int(os.environ.get("TFKP_PREVIEW_CACHE", "512"))
+
+# Параметры отрисовки помимо параметров варианта (sweep.VARIANT_DEFAULTS):
+# scale — растяжение сценария VARIANT_TIMELINE (число кадров), dpi кадра
+RENDER_DEFAULTS = {"scale": 1.0, "dpi": 72}
+# Параметры, от которых сетка не зависит
+CLOUD_ONLY = ("num_pts",)
+# Допустимые значения параметров запроса [от, до]: сетка строится в
+# процессе сервера, поэтому ее размер (n_rays, n_arcs) ограничен. Целые
+# параметры — те, у которых значение по умолчанию целое.
+PARAM_RANGES = {
+    "alpha": (-2 * np.pi, 2 * np.pi),
+    "beta": (-2 * np.pi, 2 * np.pi),
+    "radius": (0.2, 10.0),
+    "target_radius": (0.1, 100.0),
+    "n_rays": (2, 200),
+    "n_arcs": (2, 200),
+    "num_pts": (1, 10 ** 6),
+    "scale": (0.1, 10.0),
+    "dpi": (10, 300),
+}
+
+
+# =========================================================================
+# 1. LRU-КЭШ
+# =========================================================================
+
+class LRUCache:
+    """
+    Кэш результатов асинхронных вычислений по ключу с вытеснением давно
+    не использованных. Хранятся задачи asyncio, поэтому одновременные
+    запросы с одним ключом ждут одно вычисление; неудачные вычисления
+    из кэша удаляются.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.hits = self.misses = 0
+
+    async def get(self, key, compute):
+        """Результат для key; при промахе — await compute()."""
+        task = self.items.get(key)
+        if task is not None:
+            self.hits += 1
+            self.items.move_to_end(key)
+        else:
+            self.misses += 1
+            task = self.items[key] = asyncio.ensure_future(compute())
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if self.items.get(key) is task:
+                del self.items[key]
+            raise
+
+    def stats(self):
+        return {"size": len(self.items), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+# =========================================================================
+# 2. ОТРИСОВКА В ПРОЦЕССАХ ПУЛА
+# =========================================================================
+
+# Фигуры процесса-исполнителя по ключу сетки и сценария: следующий кадр
+# той же сетки стоит только update и savefig
+_figures = OrderedDict()
+WORKER_FIGURES = 4
+
+
+def _figure(key, build):
+    entry = _figures.get(key)
+    if entry is None:
+        import matplotlib.pyplot as plt
+
+        entry = _figures[key] = build()
+        while len(_figures) > WORKER_FIGURES:
+            plt.close(_figures.popitem(last=False)[1][0])
+    _figures.move_to_end(key)
+    return entry
+
+
+def _png(fig, dpi):
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi)
+    return buf.getvalue()
+
+
+def render_frame(key, grid, scale, frame, dpi):
+    """PNG кадра frame анимации варианта (full_mapping.build_animation)."""
+    from functools import partial
+
+    from tfkp.full_mapping import build_animation
+
+    timeline = Timeline(VARIANT_TIMELINE.steps, scale=scale)
+    fig, update = _figure(("frame", key, scale), partial(
+        build_animation, *grid, timeline=timeline, limits=animation_limits(grid)))
+    update(frame)
+    return _png(fig, dpi)
+
+
+def render_panel(key, p, grid, stage, dpi):
+    """PNG панели stage (0..3 — D, H, K, G) схемы варианта p по сетке."""
+    import matplotlib.pyplot as plt
+
+    from tfkp.sweep import panel_limits, panel_titles
+
+    fig, ax = plt.subplots(figsize=(4.5, 4.5))
+    points = grid[stage]
+    ax.plot(points.real, points.imag, 'b-', lw=0.8, alpha=0.6)
+    ax.set_title(panel_titles(p)[stage])
+    ax.axhline(0, color='k', lw=0.8)
+    ax.axvline(0, color='k', lw=0.8)
+    if stage >= 2:
+        r = 1.0 if stage == 2 else p["target_radius"]
+        ax.add_patch(plt.Circle((0, 0), r, color='red', fill=False, linestyle='--'))
+        ax.set_xlim(-1.25 * r, 1.25 * r)
+        ax.set_ylim(-1.25 * r, 1.25 * r)
+    else:
+        xlim, ylim = panel_limits(points)
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
+    ax.set_aspect('equal')
+    fig.tight_layout()
+    try:
+        return _png(fig, dpi)
+    finally:
+        plt.close(fig)
+
+
+# =========================================================================
+# 3. ПАРАМЕТРЫ ЗАПРОСА
+# =========================================================================
+
+def parse_value(name, raw, default):
+    """
+    Значение параметра name из строки raw: число в PARAM_RANGES[name],
+    целое, если целое значение по умолчанию default (7.9 для n_rays —
+    ошибка, а не 7).
+    """
+    try:
+        value = float(raw)
+    except ValueError:
+        raise ValueError(f"{name} должен быть числом: {raw!r}") from None
+    lo, hi = PARAM_RANGES[name]
+    if isinstance(default, int):
+        if not value.is_integer():
+            raise ValueError(f"{name} должен быть целым: {raw!r}")
+        value = int(value)
+    if not lo <= value <= hi:
+        raise ValueError(f"{name} должен быть в [{lo:g}, {hi:g}]: {raw!r}")
+    return value
+
+
+def request_params(query):
+    """
+    Параметры варианта и отрисовки из строки запроса (?beta=2.5&dpi=100):
+    неуказанные берутся по умолчанию, указанные проверяет parse_value.
+    """
+    values = dict(VARIANT_DEFAULTS, **RENDER_DEFAULTS)
+    for name, items in parse_qs(query).items():
+        if name in ("frame", "stage"):
+            continue
+        if name not in values:
+            raise ValueError(f"Неизвестный параметр: {name!r}")
+        values[name] = parse_value(name, items[-1], values[name])
+    render = {name: values.pop(name) for name in RENDER_DEFAULTS}
+    return variant_params(values), render
+
+
+def grid_key(p):
+    return tuple(sorted((k, v) for k, v in p.items() if k not in CLOUD_ONLY))
+
+
+def index_of(query, name, count):
+    """Целый параметр name строки запроса в [0, count)."""
+    items = parse_qs(query).get(name)
+    try:
+        value = int(items[-1]) if items else 0
+    except ValueError:
+        raise ValueError(f"{name} должен быть целым: {items[-1]!r}") from None
+    if not 0 <= value < count:
+        raise ValueError(f"{name} должен быть в [0, {count})")
+    return value
+
+
+# =========================================================================
+# 4. HTTP-СЕРВЕР
+# =========================================================================
+
+INDEX_HTML = """<!DOCTYPE html>
+<html lang="ru"><head><meta charset="utf-8"><title>ТФКП: просмотр отображения</title>
+<style>body{font-family:sans-serif;margin:1em}label{margin-right:1em}img{border:1px solid #ccc}</style>
+</head><body>
+<h3>Сектор D &rarr; H &rarr; K &rarr; G</h3>
+<form id="params">%(inputs)s</form>
+<p><label>кадр <input id="frame" type="range" min="0" max="%(last)d" value="0"></label>
+<span id="info"></span></p>
+<img id="anim" width="504" height="504">
+<p>%(panels)s</p>
+<script>
+const form = document.getElementById("params"), frame = document.getElementById("frame");
+function query() { return new URLSearchParams(new FormData(form)).toString(); }
+async function refresh() {
+  const q = query(), info = await (await fetch("/params?" + q)).json();
+  if (info.error) { document.getElementById("info").textContent = info.error; return; }
+  frame.max = info.frames - 1;
+  document.getElementById("info").textContent = "из " + info.frames;
+  document.getElementById("anim").src = "/frame?" + q + "&frame=" + frame.value;
+  for (let s = 0; s < 4; s++) document.getElementById("panel" + s).src = "/panel?" + q + "&stage=" + s;
+}
+frame.oninput = () => { document.getElementById("anim").src = "/frame?" + query() + "&frame=" + frame.value; };
+form.onchange = refresh;
+refresh();
+</script></body></html>
+"""
+
+
+class PreviewServer:
+    """
+    Сервер просмотра: GET /frame (кадр анимации), /panel (панель схемы),
+    /params (параметры и число кадров), /stats (состояние кэшей) и
+    страница / с полями параметров. Сетки считаются в потоке, кадры и
+    панели рисуются в пуле из workers процессов; сетки и PNG хранятся в
+    LRU-кэшах по параметрам, так что повторный запрос отдается из памяти.
+    """
+
+    def __init__(self, workers=None, cache_size=None):
+        ctx = mp.get_context("spawn")
+        self.pool = ProcessPoolExecutor(workers or PREVIEW_WORKERS, mp_context=ctx)
+        self.grids = LRUCache(PREVIEW_GRIDS)
+        self.images = LRUCache(cache_size or PREVIEW_CACHE)
+
+    async def grid(self, p):
+        loop = asyncio.get_running_loop()
+        return await self.grids.get(grid_key(p), lambda: loop.run_in_executor(None, variant_grid, p))
+
+    async def render(self, key, func, *args):
+        loop = asyncio.get_running_loop()
+
+        async def compute():
+            return await loop.run_in_executor(self.pool, func, *args)
+        return await self.images.get(key, compute)
+
+    async def route(self, path, query):
+        """(статус, тип содержимого, тело) ответа на GET path?query."""
+        if path == "/":
+            inputs = "".join(f'<label>{name} <input name="{name}" value="{value:g}" size="6"></label>'
+                             for name, value in dict(VARIANT_DEFAULTS, **RENDER_DEFAULTS).items())
+            panels = "".join(f'<img id="panel{s}" width="324" height="324">' for s in range(4))
+            html = INDEX_HTML % {"inputs": inputs, "panels": panels, "last": len(VARIANT_TIMELINE) - 1}
+            return 200, "text/html; charset=utf-8", html.encode()
+        if path == "/stats":
+            body = {"grids": self.grids.stats(), "images": self.images.stats()}
+            return 200, "application/json", json.dumps(body).encode()
+
+        p, render = request_params(query)
+        frames = len(Timeline(VARIANT_TIMELINE.steps, scale=render["scale"]))
+        if path == "/params":
+            return 200, "application/json", json.dumps(dict(p, **render, frames=frames)).encode()
+
+        grid = await self.grid(p)
+        key = grid_key(p)
+        if path == "/frame":
+            frame = index_of(query, "frame", frames)
+            png = await self.render(("frame", key, render["scale"], frame, render["dpi"]),
+                                    render_frame, key, grid, render["scale"], frame, render["dpi"])
+        elif path == "/panel":
+            stage = index_of(query, "stage", 4)
+            png = await self.render(("panel", key, stage, render["dpi"]),
+                                    render_panel, key, p, grid, stage, render["dpi"])
+        else:
+            return 404, "text/plain; charset=utf-8", "Не найдено".encode()
+        return 200, "image/png", png
+
+    async def handle(self, reader, writer):
+        try:
+            request = await reader.readline()
+            # Заголовки запроса не нужны: читаем до пустой строки
+            while (await reader.readline()).strip():
+                pass
+            method, target, _ = request.decode("latin-1").split(" ", 2)
+            url = urlsplit(target)
+            if method != "GET":
+                status, ctype, body = 405, "text/plain; charset=utf-8", "Только GET".encode()
+            else:
+                try:
+                    status, ctype, body = await self.route(url.path, url.query)
+                except ValueError as e:
+                    if url.path == "/params":
+                        status, ctype, body = 200, "application/json", json.dumps({"error": str(e)}).encode()
+                    else:
+                        status, ctype, body = 400, "text/plain; charset=utf-8", str(e).encode()
+                except Exception as e:
+                    status, ctype, body = 500, "text/plain; charset=utf-8", f"Ошибка отрисовки: {e}".encode()
+            reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                      500: "Internal Server Error"}[status]
+            writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: {ctype}\r\n"
+                         f"Content-Length: {len(body)}\r\nCache-Control: no-store\r\n"
+                         f"Connection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8000):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Просмотр: http://{host}:{port}/")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tfkp.preview", description="Локальный просмотр отображения D -> G.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None, help="процессов отрисовки (TFKP_PREVIEW_WORKERS)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(PreviewServer(args.workers).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
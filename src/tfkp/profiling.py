@@ -0,0 +1,221 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Замер этапов построения: TFKP_PROFILE=1 — время этапов и каждого кадра
+# анимации, TFKP_PROFILE=memory — плюс пики памяти tracemalloc (медленнее).
+# Отчет пишется при выходе в PROFILE_DIR (не хранится в git, см. .gitignore).
+PROFILE = os.environ.get("TFKP_PROFILE", "0")
+PROFILE_DIR = os.path.join(project_root, "output", "profile")
+
+# Пустой контекст для выключенного замера: span() стоит один вызов функции
+_NULL = nullcontext()
+_profiler = None
+
+
+# =========================================================================
+# 1. ЗАМЕР ВЛОЖЕННЫХ ЭТАПОВ
+# =========================================================================
+
+class Profiler:
+    """
+    Дерево этапов: каждый span(name) внутри другого становится его
+    потомком, а этап задается путем "внешний;внутренний". Для пути
+    накапливаются число вызовов, полное и собственное (без потомков)
+    время и список длительностей всех вызовов — для этапов кадра
+    анимации это время каждого кадра.
+
+    При memory=True для этапа записывается пик памяти tracemalloc и его
+    прирост относительно памяти на входе в этап. Замер ведется только в
+    основном потоке (этапы скриптов и записи GIF).
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.stack = []  # [путь, начало, время потомков, пик памяти, память на входе]
+        self.stats = {}
+        self.started = time.perf_counter()
+        if memory:
+            import tracemalloc
+            self.tracemalloc = tracemalloc
+            tracemalloc.start()
+
+    def _enter(self, name):
+        path = f"{self.stack[-1][0]};{name}" if self.stack else name
+        current = peak = 0
+        if self.memory:
+            current, peak = self.tracemalloc.get_traced_memory()
+            if self.stack:
+                self.stack[-1][3] = max(self.stack[-1][3], peak)
+            self.tracemalloc.reset_peak()
+        self.stack.append([path, time.perf_counter(), 0.0, current, current])
+
+    def _exit(self):
+        path, start, children, peak, entry = self.stack.pop()
+        elapsed = time.perf_counter() - start
+        if self.memory:
+            peak = max(peak, self.tracemalloc.get_traced_memory()[1])
+            if self.stack:
+                self.stack[-1][3] = max(self.stack[-1][3], peak)
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+        entry_stats = self.stats.get(path)
+        if entry_stats is None:
+            entry_stats = self.stats[path] = {"count": 0, "total_s": 0.0, "self_s": 0.0,
+                                              "peak_mb": 0.0, "growth_mb": 0.0, "times": []}
+        entry_stats["count"] += 1
+        entry_stats["total_s"] += elapsed
+        entry_stats["self_s"] += elapsed - children
+        entry_stats["times"].append(elapsed)
+        if self.memory:
+            entry_stats["peak_mb"] = max(entry_stats["peak_mb"], peak / 2 ** 20)
+            entry_stats["growth_mb"] = max(entry_stats["growth_mb"], (peak - entry) / 2 ** 20)
+
+    def span(self, name):
+        return _Span(self, name)
+
+    def report(self):
+        """Отчет в виде словаря (для JSON): этапы в порядке первого вызова."""
+        spans = []
+        for path, s in self.stats.items():
+            record = {"path": path, "name": path.rsplit(";", 1)[-1], "depth": path.count(";")}
+            record.update(s)
+            if not self.memory:
+                del record["peak_mb"], record["growth_mb"]
+            spans.append(record)
+        return {"script": script_name(), "memory": self.memory,
+                "wall_s": time.perf_counter() - self.started, "spans": spans}
+
+    def folded(self):
+        """
+        Строки "внешний;внутренний микросекунды" по собственному времени —
+        формат свернутых стеков для flamegraph.pl и speedscope.
+        """
+        return "".join(f"{path} {int(round(s['self_s'] * 1e6))}\n" for path, s in self.stats.items())
+
+
+class _Span:
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler, name):
+        self.profiler, self.name = profiler, name
+
+    def __enter__(self):
+        self.profiler._enter(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._exit()
+
+
+# =========================================================================
+# 2. ВКЛЮЧЕНИЕ И ТОЧКИ ЗАМЕРА
+# =========================================================================
+
+def script_name():
+    """
+    Имя запущенного скрипта без расширения (имя файла отчета); для
+    python -m tfkp (tfkp/__main__.py) — имя пакета.
+    """
+    path = sys.argv[0] if sys.argv and sys.argv[0] else ""
+    name = os.path.splitext(os.path.basename(path))[0]
+    if name == "__main__":
+        name = os.path.basename(os.path.dirname(path))
+    return name if name and name != "-c" else "python"
+
+
+def enable(memory=False, directory=None):
+    """
+    Включает замер (если еще не включен); отчет сохраняется при выходе
+    из процесса в directory (по умолчанию PROFILE_DIR).
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler(memory)
+        atexit.register(save_report, directory=directory)
+    return _profiler
+
+
+def enabled():
+    return _profiler is not None
+
+
+def span(name):
+    """Контекст замера этапа name; при выключенном замере ничего не делает."""
+    if _profiler is None:
+        return _NULL
+    return _profiler.span(name)
+
+
+def profiled(name=None):
+    """
+    Декоратор: весь вызов функции — этап name (по умолчанию
+    "<файл модуля>.<функция>", так что одноименные функции скриптов
+    различаются и при запуске скрипта напрямую).
+    """
+    def decorator(func):
+        label = name
+        if label is None:
+            module = getattr(sys.modules.get(func.__module__), "__file__", None) or func.__module__
+            label = f"{os.path.splitext(os.path.basename(module))[0]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return func(*args, **kwargs)
+            with _profiler.span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed(func, name):
+    """
+    func, каждый вызов которой — этап name (например, update кадра
+    анимации). При выключенном замере возвращает саму func.
+    """
+    if _profiler is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _profiler.span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# =========================================================================
+# 3. ОТЧЕТ
+# =========================================================================
+
+def save_report(prefix=None, directory=None):
+    """
+    Записывает отчет <directory>/<prefix>.json (время, память и
+    длительности вызовов этапов) и <prefix>.folded (свернутые стеки для
+    flamegraph). prefix по умолчанию — имя скрипта. Возвращает путь JSON.
+    """
+    if _profiler is None or not _profiler.stats:
+        return None
+    if directory is None:
+        directory = PROFILE_DIR
+    if prefix is None:
+        prefix = script_name()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{prefix}.json")
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(_profiler.report(), fp, indent=2, ensure_ascii=False)
+    with open(os.path.join(directory, f"{prefix}.folded"), "w", encoding="utf-8") as fp:
+        fp.write(_profiler.folded())
+    print(f"Отчет о замере записан в '{path}'.")
+    return path
+
+
+if PROFILE not in ("", "0"):
+    enable(memory=PROFILE == "memory")
@@ -0,0 +1,79 @@
+import numpy as np
+
+from tfkp.clouds import SECTOR_HUE
+from tfkp.mapping_chain import pull_back
+
+# Способы раскраски прообраза: по аргументу (как облака точек) или по модулю
+COLOR_MODES = ("arg", "abs")
+
+
+# =========================================================================
+# 1. РАСКРАСКА ПЛОСКОСТИ ПО ПРООБРАЗУ В D
+# =========================================================================
+
+def in_sector(z):
+    """Маска точек сектора D: |z| < 2, pi/4 < arg(z) < 3pi/4."""
+    arg = np.angle(z)
+    return (np.abs(z) < 2.0) & (arg > SECTOR_HUE[0]) & (arg < SECTOR_HUE[1])
+
+
+def pullback_rgba(w, stage, color_by="arg", alpha=1.0):
+    """
+    RGBA-цвета точек w плоскости этапа stage (0 — D, 1 — H, 2 — K, 3 — G).
+
+    Каждая точка обратными отображениями переводится в z-плоскость и
+    окрашивается по arg z (карта 'hsv', как у облаков точек) или по |z|
+    (карта 'viridis'). Точки, прообраз которых не лежит в D, прозрачны.
+    """
+    import matplotlib
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = pull_back(w, stage)
+        inside = in_sector(z)
+
+    if color_by == "arg":
+        lo, hi = SECTOR_HUE
+        values, cmap = (np.angle(z) - lo) / (hi - lo), 'hsv'
+    elif color_by == "abs":
+        values, cmap = np.abs(z) / 2.0, 'viridis'
+    else:
+        raise ValueError(f"Неизвестный способ раскраски: {color_by!r}, ожидается один из {COLOR_MODES}")
+
+    rgba = matplotlib.colormaps[cmap](np.where(inside, values, 0.0))
+    rgba[..., 3] = np.where(inside, alpha, 0.0)
+    return rgba
+
+
+# =========================================================================
+# 2. ОТРИСОВКА ПАНЕЛЕЙ
+# =========================================================================
+
+def save_pullback(fig, axes, stages, path, color_by="arg", dpi=200, alpha=1.0):
+    """
+    Заполняет оси axes раскраской по прообразу и сохраняет фигуру в path.
+
+    stages[i] — номер этапа, плоскость которого изображена на оси axes[i].
+    Фигура должна быть оформлена заранее (заголовки, пределы, окружности).
+    Цвет вычисляется один раз для центра каждого пикселя оси, поэтому
+    картинка не имеет пропусков, а стоимость пропорциональна числу пикселей.
+    """
+    fig.set_dpi(dpi)
+    # Расчет раскладки: размеры осей в пикселях с учетом set_aspect
+    fig.canvas.draw()
+
+    for ax, stage in zip(axes, stages):
+        bbox = ax.get_window_extent()
+        nx, ny = max(int(round(bbox.width)), 1), max(int(round(bbox.height)), 1)
+        (x0, x1), (y0, y1) = ax.get_xlim(), ax.get_ylim()
+
+        # Центры пикселей
+        xs = x0 + (np.arange(nx) + 0.5) * ((x1 - x0) / nx)
+        ys = y0 + (np.arange(ny) + 0.5) * ((y1 - y0) / ny)
+        w = xs[np.newaxis, :] + 1j * ys[:, np.newaxis]
+
+        ax.imshow(pullback_rgba(w, stage, color_by, alpha), extent=(x0, x1, y0, y1),
+                  origin='lower', interpolation='nearest', aspect=ax.get_aspect())
+        ax.set_xlim(x0, x1)
+        ax.set_ylim(y0, y1)
+
+    fig.savefig(path, dpi=dpi)
@@ -0,0 +1,221 @@
+import re
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from tfkp.timeline import Move
+
+# Ширина картинки в пикселях и высота полосы заголовка; высота области
+# графика следует из пределов осей (масштаб по осям одинаковый)
+SVG_WIDTH = 600
+TITLE_HEIGHT = 40
+# Знаков после запятой в координатах: 0.001 единицы — меньше пикселя
+SVG_DIGITS = 3
+
+# Сглаживания Timeline как кривые Безье keySplines (SMIL, calcMode="spline"):
+# t*t*(3 - 2t) — ровно кривая с опорными точками (1/3, 0) и (2/3, 1),
+# косинусное — стандартное приближение ease-in-out-sine
+KEY_SPLINES = {
+    "linear": "0 0 1 1",
+    "smooth": "0.333 0 0.667 1",
+    "cosine": "0.37 0 0.63 1",
+}
+
+# Формулы заголовков Matplotlib ($...$) в обычный текст (plain_text):
+# команды TeX, у которых есть символ Unicode; неизвестные команды
+# остаются как есть
+MATH_SYMBOLS = {
+    "to": "→", "pi": "π", "alpha": "α", "beta": "β", "infty": "∞", "cdot": "·",
+    "pm": "±", "le": "≤", "ge": "≥", "in": "∈", "arg": "arg", "Im": "Im", "Re": "Re",
+}
+MATH_BLACKBOARD = {"C": "ℂ", "R": "ℝ", "N": "ℕ", "Z": "ℤ", "Q": "ℚ", "H": "ℍ"}
+SUBSCRIPTS = dict(zip("0123456789+-=()", "₀₁₂₃₄₅₆₇₈₉₊₋₌₍₎"))
+SUPERSCRIPTS = dict(zip("0123456789+-=()", "⁰¹²³⁴⁵⁶⁷⁸⁹⁺⁻⁼⁽⁾"))
+
+
+# =========================================================================
+# 1. КООРДИНАТЫ И ТЕКСТ
+# =========================================================================
+
+def _script(match):
+    """_1, ^{2} и т. п. — индекс Unicode, если он есть для всех символов."""
+    table = SUBSCRIPTS if match.group(1) == "_" else SUPERSCRIPTS
+    text = match.group(2) if match.group(2) is not None else match.group(3)
+    if text and all(c in table for c in text):
+        return "".join(table[c] for c in text)
+    return match.group(0)
+
+
+def math_text(tex):
+    """
+    Формула TeX без $ как обычный текст. Переводятся только известные
+    конструкции: \\frac{a}{b} -> (a)/(b), \\text{...}, \\mathbb{C} -> ℂ,
+    индексы _ и ^ (если у всех символов есть индекс Unicode) и команды
+    MATH_SYMBOLS; остальные символы, в том числе скобки, не меняются.
+    """
+    frac = re.compile(r"\\frac\{([^{}]*)\}\{([^{}]*)\}")
+    while frac.search(tex):
+        tex = frac.sub(r"(\1)/(\2)", tex)
+    tex = re.sub(r"\\(?:text|mathrm|mathit)\{([^{}]*)\}", r"\1", tex)
+    tex = re.sub(r"\\mathbb\{([^{}]*)\}",
+                 lambda m: "".join(MATH_BLACKBOARD.get(c, c) for c in m.group(1)), tex)
+    tex = re.sub(r"\\[,;:! ]", " ", tex)
+    tex = re.sub(r"\\([A-Za-z]+)", lambda m: MATH_SYMBOLS.get(m.group(1), m.group(0)), tex)
+    return re.sub(r"([_^])(?:\{([^{}]*)\}|([0-9A-Za-z+\-=()]))", _script, tex)
+
+
+def plain_text(title):
+    """
+    Заголовок с формулами Matplotlib ($z_1 = -i z^2$) как обычный текст:
+    формулы переводит math_text, текст вне $...$ не меняется.
+    """
+    title = re.sub(r"\$([^$]*)\$", lambda m: math_text(m.group(1)), title)
+    return re.sub(r"\s+", " ", title).strip()
+
+
+def number(v, digits=SVG_DIGITS):
+    """Число без лишних нулей: 1.500 -> 1.5, 2.000 -> 2."""
+    s = f"{v:.{digits}f}".rstrip("0").rstrip(".")
+    return "0" if s in ("", "-0") else s
+
+
+def fraction(v):
+    """Доля длительности для keyTimes."""
+    return number(v, 4)
+
+
+def polyline_runs(positions):
+    """
+    Непрерывные участки ломаной: (начало, конец) отрезков индексов, где
+    точки конечны во всех ключевых сетках positions. Разрывы (NaN между
+    линиями сетки, бесконечности около полюса) общие для всех сеток,
+    поэтому пути ключевых кадров состоят из одинаковых команд и SMIL
+    может интерполировать их поточечно.
+    """
+    finite = np.logical_and.reduce([np.isfinite(z) for z in positions])
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], finite.astype(np.int8), [0]])))
+    return [(a, b) for a, b in zip(edges[::2], edges[1::2]) if b - a >= 2]
+
+
+def path_data(z, runs, digits=SVG_DIGITS):
+    """
+    Атрибут d пути SVG по сетке z: на каждом участке "M x y x y ..."
+    (после M пары координат — неявные L). Ось y SVG направлена вниз,
+    поэтому y = -Im z.
+    """
+    parts = []
+    for a, b in runs:
+        xy = np.column_stack([z[a:b].real, -z[a:b].imag]).ravel()
+        parts.append("M" + " ".join(number(v, digits) for v in xy))
+    return "".join(parts)
+
+
+# =========================================================================
+# 2. СЦЕНАРИЙ КАК АНИМАЦИЯ SMIL
+# =========================================================================
+
+def key_times(timeline, fps):
+    """
+    Ключевые моменты сценария timeline: (длительность в секундах, номера
+    сеток, доли времени keyTimes, keySplines). На каждом шаге Hold
+    сетка повторяется, на шаге Move — переход к следующей со
+    сглаживанием шага.
+    """
+    keys, times, splines = [0], [0.0], []
+    elapsed = 0.0
+    for step in timeline.steps:
+        elapsed += max(int(round(step.frames * timeline.scale)), 1) / fps
+        if isinstance(step, Move):
+            keys.append(keys[-1] + 1)
+            splines.append(KEY_SPLINES[step.easing])
+        else:
+            keys.append(keys[-1])
+            splines.append(KEY_SPLINES["linear"])
+        times.append(elapsed)
+    return elapsed, keys, [t / elapsed for t in times], splines
+
+
+def title_intervals(timeline, fps):
+    """(title, начало, конец) каждого шага в долях длительности анимации."""
+    duration = key_times(timeline, fps)[0]
+    intervals, elapsed = [], 0.0
+    for step in timeline.steps:
+        start = elapsed
+        elapsed += max(int(round(step.frames * timeline.scale)), 1) / fps
+        intervals.append((step.title, start / duration, elapsed / duration))
+    return intervals
+
+
+# =========================================================================
+# 3. ЗАПИСЬ SVG
+# =========================================================================
+
+def axis_ticks(lo, hi):
+    """Линии сетки осей: целые (или четные при широких пределах) значения."""
+    step = 1 if hi - lo <= 6 else 2
+    return np.arange(np.ceil(lo / step) * step, hi + 1e-9, step)
+
+
+def svg_document(positions, timeline, fps, xlim, ylim, color="blue", alpha=0.6, width=1.0):
+    """
+    Текст SVG-анимации сетки по ключевым сеткам positions (например,
+    Z, Z1, Z2, W) и сценарию timeline при fps кадров в секунду.
+
+    Ломаная записывается одним путем; его атрибут d анимируется элементом
+    <animate> (SMIL) по ключевым кадрам с keySplines по сглаживанию шагов
+    Move, а заголовки шагов показываются по очереди (visibility, calcMode
+    discrete). Без поддержки SMIL видна исходная сетка с первым заголовком.
+    """
+    if len(positions) != timeline.segments + 1:
+        raise ValueError(f"Сценарий рассчитан на {timeline.segments + 1} сеток, получено {len(positions)}")
+    runs = polyline_runs(positions)
+    keyframes = [path_data(np.asarray(z), runs) for z in positions]
+    duration, keys, times, splines = key_times(timeline, fps)
+    dur = f"{number(duration)}s"
+
+    (x0, x1), (y0, y1) = xlim, ylim
+    height = round(SVG_WIDTH * (y1 - y0) / (x1 - x0))
+    view = f"{number(x0)} {number(-y1)} {number(x1 - x0)} {number(y1 - y0)}"
+    stroke = 'vector-effect="non-scaling-stroke"'
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}" height="{height + TITLE_HEIGHT}" '
+        f'font-family="DejaVu Sans, sans-serif">',
+        f'<rect width="100%" height="100%" fill="white"/>',
+    ]
+    for i, (title, start, end) in enumerate(title_intervals(timeline, fps)):
+        values, moments = ["hidden", "visible", "hidden"], [0, start, end]
+        if start == 0:
+            values, moments = values[1:], [0, end]
+        if end >= 1:
+            values, moments = values[:-1], moments[:-1]
+        out.append(
+            f'<text x="{SVG_WIDTH // 2}" y="{TITLE_HEIGHT * 2 // 3}" text-anchor="middle" font-size="15" '
+            f'visibility="{"visible" if i == 0 else "hidden"}">{escape(plain_text(title))}'
+            f'<animate attributeName="visibility" calcMode="discrete" dur="{dur}" repeatCount="indefinite" '
+            f'values="{";".join(values)}" keyTimes="{";".join(fraction(t) for t in moments)}"/></text>')
+
+    out.append(f'<svg y="{TITLE_HEIGHT}" width="{SVG_WIDTH}" height="{height}" viewBox="{view}">')
+    grid = [f'M{number(x)} {number(-y1)}V{number(-y0)}' for x in axis_ticks(x0, x1)]
+    grid += [f'M{number(x0)} {number(-y)}H{number(x1)}' for y in axis_ticks(y0, y1)]
+    out.append(f'<path d="{"".join(grid)}" stroke="#b0b0b0" stroke-width="0.8" '
+               f'stroke-dasharray="3 2" fill="none" {stroke}/>')
+    out.append(f'<path d="M{number(x0)} 0H{number(x1)}M0 {number(-y1)}V{number(-y0)}" '
+               f'stroke="black" stroke-width="1" fill="none" {stroke}/>')
+    out.append(
+        f'<path d="{keyframes[0]}" stroke="{color}" stroke-opacity="{alpha}" stroke-width="{width}" '
+        f'fill="none" stroke-linejoin="round" {stroke}>'
+        f'<animate attributeName="d" dur="{dur}" repeatCount="indefinite" calcMode="spline" '
+        f'keyTimes="{";".join(fraction(t) for t in times)}" keySplines="{";".join(splines)}" '
+        f'values="{";".join(keyframes[k] for k in keys)}"/></path>')
+    out.append(f'<rect x="{number(x0)}" y="{number(-y1)}" width="{number(x1 - x0)}" '
+               f'height="{number(y1 - y0)}" fill="none" stroke="black" stroke-width="1" {stroke}/>')
+    out.append("</svg>")
+    out.append("</svg>")
+    return "\n".join(out) + "\n"
+
+
+def save_svg_animation(path, positions, timeline, fps, xlim, ylim, **style):
+    """Сохраняет SVG-анимацию (svg_document) в path."""
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write(svg_document(positions, timeline, fps, xlim, ylim, **style))
@@ -0,0 +1,314 @@
+import itertools
+import json
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from tfkp.clouds import unit_square
+from tfkp.full_mapping import build_animation, setup_panels
+from tfkp.grids import GRID_TOL, PILOT_SAMPLES, polar_grid, thin_grid
+from tfkp.mapping_chain import f2
+from tfkp.timeline import Hold, Move, Timeline
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Папка результатов перебора: по подпапке на вариант и индекс index.json
+SWEEP_DIR = os.path.join(project_root, "output", "sweep")
+
+# Число процессов перебора; переменная окружения TFKP_SWEEP_WORKERS
+SWEEP_WORKERS = int(os.environ.get("TFKP_SWEEP_WORKERS", str(os.cpu_count() or 1)))
+
+# Параметры варианта задания по умолчанию (вариант 20): сектор
+# alpha < arg z < beta, |z| < radius, целевой круг радиуса target_radius,
+# n_rays лучей и n_arcs дуг сетки, num_pts точек облака
+VARIANT_DEFAULTS = {
+    "alpha": np.pi / 4,
+    "beta": 3 * np.pi / 4,
+    "radius": 2.0,
+    "target_radius": np.pi,
+    "n_rays": 30,
+    "n_arcs": 15,
+    "num_pts": 10000,
+}
+
+
+# =========================================================================
+# 1. ВАРИАНТЫ ЗАДАНИЯ
+# =========================================================================
+
+def parameter_grid(**axes):
+    """
+    Все сочетания значений параметров: parameter_grid(beta=[...], radius=[...])
+    — список словарей для run_sweep. Не заданные параметры берутся из
+    VARIANT_DEFAULTS.
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def variant_params(params):
+    """Полный набор параметров варианта с проверкой сектора."""
+    unknown = set(params) - set(VARIANT_DEFAULTS) - {"name"}
+    if unknown:
+        raise ValueError(f"Неизвестные параметры варианта: {sorted(unknown)}")
+    p = dict(VARIANT_DEFAULTS, **params)
+    if not 0 < p["beta"] - p["alpha"] <= 2 * np.pi:
+        raise ValueError(f"Раствор сектора должен быть в (0, 2pi]: {p['beta'] - p['alpha']}")
+    return p
+
+
+def named_variants(variants):
+    """
+    [(имя, параметры)] вариантов variants с проверкой variant_params.
+    Имя — параметр name или variant_<номер>; имена задают папки и записи
+    индекса, поэтому повторяться не могут.
+    """
+    named, seen = [], set()
+    for i, params in enumerate(variants):
+        p = variant_params(params)
+        name = p.pop("name", None) or f"variant_{i:03d}"
+        if name in seen:
+            raise ValueError(f"Повторяющееся имя варианта: {name!r}")
+        seen.add(name)
+        named.append((name, p))
+    return named
+
+
+def sector_map(z, alpha, beta):
+    """
+    D -> H для сектора alpha < arg z < beta: поворот биссектрисы на мнимую
+    ось и степень pi / (beta - alpha), z1 = i (z e^{-i(alpha+beta)/2})^p.
+    Для alpha = pi/4, beta = 3pi/4 это z1 = -i z^2.
+    """
+    p = np.pi / (beta - alpha)
+    return 1j * (z * np.exp(-0.5j * (alpha + beta))) ** p
+
+
+def variant_chain(z, p):
+    """Образы точек z сектора варианта p в H, K, G: (z1, z2, w)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z1 = sector_map(z, p["alpha"], p["beta"])
+        z2 = f2(z1)
+    return z1, z2, p["target_radius"] * z2
+
+
+def variant_grid(p):
+    """Сетка сектора варианта, прореженная на всех четырех этапах: (Z, Z1, Z2, W)."""
+    rs = np.linspace(0.1, p["radius"], p["n_arcs"])
+    thetas = np.linspace(p["alpha"], p["beta"], p["n_rays"])
+    Z = polar_grid(rs, thetas, p["radius"], (p["alpha"], p["beta"]), PILOT_SAMPLES)
+    return thin_grid((Z,) + variant_chain(Z, p), PILOT_SAMPLES, GRID_TOL)
+
+
+def variant_cloud(p):
+    """Облако сектора варианта (clouds.unit_square) и его образы: (z, z1, z2, w)."""
+    u, v = unit_square(p["num_pts"])
+    z = np.sqrt(p["radius"] ** 2 * u) * np.exp(1j * (p["alpha"] + (p["beta"] - p["alpha"]) * v))
+    return (z,) + variant_chain(z, p)
+
+
+def panel_limits(points, margin=0.1):
+    """Пределы (xlim, ylim) панели по конечным точкам points с запасом margin."""
+    points = points[np.isfinite(points)]
+    x0, x1 = points.real.min(), points.real.max()
+    y0, y1 = points.imag.min(), points.imag.max()
+    pad = margin * max(x1 - x0, y1 - y0, 1e-9)
+    return (x0 - pad, x1 + pad), (y0 - pad, y1 + pad)
+
+
+# =========================================================================
+# 2. ОТРИСОВКА ОДНОГО ВАРИАНТА
+# =========================================================================
+
+def panel_titles(p):
+    phi = (p["alpha"] + p["beta"]) / 2
+    power = np.pi / (p["beta"] - p["alpha"])
+    return [
+        f"(a) Область $D$\n(${p['alpha']:.3g} < \\arg z < {p['beta']:.3g}$, $|z| < {p['radius']:g}$)",
+        f"(b) Область $H$\n($z_1 = i\\,(z e^{{-{phi:.3g} i}})^{{{power:.3g}}}$)",
+        "(c) Область $K$\n($z_2 = (z_1-i)/(z_1+i)$)",
+        f"(d) Область $G$\n($w = {p['target_radius']:.3g} z_2$)",
+    ]
+
+
+def variant_panel_limits(p):
+    """
+    Пределы панелей схемы варианта для full_mapping.setup_panels: D и H —
+    по точкам облака, круги K и G видны целиком.
+    """
+    return [None, None] + [((-1.25 * r, 1.25 * r), (-1.25 * r, 1.25 * r))
+                           for r in (1.0, p["target_radius"])]
+
+
+def save_variant_image(p, path):
+    """Схема D -> H -> K -> G варианта p по облаку точек (как full_mapping.png)."""
+    import matplotlib.pyplot as plt
+
+    cloud = variant_cloud(p)
+    colors = np.angle(cloud[0])
+    fig, ax = plt.subplots(1, 4, figsize=(18, 5))
+    for i, points in enumerate(cloud):
+        ax[i].scatter(points.real, points.imag, c=colors, cmap='hsv', s=1, alpha=0.5)
+    setup_panels(ax, panel_titles(p), variant_panel_limits(p), p["target_radius"])
+    plt.tight_layout()
+    plt.savefig(path, dpi=200)
+    plt.close(fig)
+
+
+# Сценарий анимации варианта: те же паузы и переходы, что в full_mapping,
+# с заголовками без конкретных формул
+VARIANT_TIMELINE = Timeline([
+    Hold(5, "Стадия 1: Исходный сектор $D$"),
+    Move(25, "Переход $D \\to H$"),
+    Hold(5, "Стадия 2: Верхняя полуплоскость $H$"),
+    Move(25, "Переход $H \\to K$"),
+    Hold(5, "Стадия 3: Единичный круг $K$"),
+    Move(25, "Переход $K \\to G$"),
+    Hold(10, "Конец: Целевой круг $G$"),
+])
+
+
+def animation_limits(grid):
+    """
+    Общие квадратные пределы анимации по сетке grid = (Z, Z1, Z2, W): все
+    четыре этапа, но не дальше 3 радиусов круга G, чтобы далекие образы
+    около полюса не сжимали картинку.
+    """
+    w_limits = panel_limits(grid[3])
+    clip = 3 * max(abs(v) for lim in w_limits for v in lim)
+    points = np.concatenate(grid)
+    points = points[np.abs(points) < clip]
+    (x0, x1), (y0, y1) = panel_limits(points)
+    half = max(x1 - x0, y1 - y0) / 2
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    return (cx - half, cx + half), (cy - half, cy + half)
+
+
+def save_variant_animation(grid, path, fps=15):
+    """GIF-анимация варианта по сетке grid = (Z, Z1, Z2, W)."""
+    from tfkp.gif_render import save_animation
+
+    save_animation(partial(build_animation, *grid, timeline=VARIANT_TIMELINE,
+                           limits=animation_limits(grid)),
+                   VARIANT_TIMELINE.frames, path, fps=fps, interval=1000 // fps)
+
+
+# =========================================================================
+# 3. ОБЩИЕ СЕТКИ В РАЗДЕЛЯЕМОЙ ПАМЯТИ
+# =========================================================================
+
+class SharedArrays:
+    """
+    Несколько массивов в одном блоке multiprocessing.shared_memory.
+
+    spec — описание (имя блока, [(смещение, форма, тип), ...]), которое
+    передается процессам вместо самих массивов: attach(spec) открывает
+    тот же блок и возвращает массивы без копирования. Блок принадлежит
+    создавшему процессу и удаляется его методом release().
+    """
+
+    def __init__(self, arrays):
+        arrays = [np.ascontiguousarray(a) for a in arrays]
+        self.shm = SharedMemory(create=True, size=max(sum(a.nbytes for a in arrays), 1))
+        layout, offset = [], 0
+        for a in arrays:
+            np.ndarray(a.shape, a.dtype, buffer=self.shm.buf, offset=offset)[...] = a
+            layout.append((offset, a.shape, a.dtype.str))
+            offset += a.nbytes
+        self.spec = (self.shm.name, layout)
+
+    @staticmethod
+    def attach(spec):
+        """(shm, массивы) по описанию spec; shm нужно закрыть после работы."""
+        name, layout = spec
+        shm = SharedMemory(name=name)
+        arrays = [np.ndarray(shape, np.dtype(dtype), buffer=shm.buf, offset=offset)
+                  for offset, shape, dtype in layout]
+        return shm, arrays
+
+    def release(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+# =========================================================================
+# 4. ПАРАЛЛЕЛЬНЫЙ ПЕРЕБОР ВАРИАНТОВ
+# =========================================================================
+
+def _render_variant(task):
+    """Рисует картинку и анимацию одного варианта в процессе пула."""
+    name, p, spec, directory = task
+    record = {"name": name, "params": p, "outputs": {}, "timings": {}, "error": None}
+    folder = os.path.join(directory, name)
+    os.makedirs(folder, exist_ok=True)
+    shm, grid = SharedArrays.attach(spec)
+    try:
+        for key, filename, render in (
+                ("image", "full_mapping.png", lambda path: save_variant_image(p, path)),
+                ("animation", "conformal_animation_full.gif",
+                 lambda path: save_variant_animation(grid, path))):
+            path = os.path.join(folder, filename)
+            start = time.perf_counter()
+            render(path)
+            record["timings"][key] = time.perf_counter() - start
+            record["outputs"][key] = os.path.relpath(path, project_root)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        del grid
+        shm.close()
+    return record
+
+
+def run_sweep(variants, directory=None, workers=None):
+    """
+    Рисует схему и анимацию для каждого набора параметров variants
+    (список словарей, например parameter_grid(...)), по процессу на вариант.
+
+    Сетки всех вариантов строятся в основном процессе и передаются
+    процессам через разделяемую память (SharedArrays), облака строятся
+    в процессах. Результаты пишутся в <directory>/<имя>/, а индекс —
+    имена, параметры, пути файлов, время этапов и ошибки — в
+    <directory>/index.json. Возвращает список записей индекса.
+    """
+    if directory is None:
+        directory = SWEEP_DIR
+    if workers is None:
+        workers = SWEEP_WORKERS
+    os.makedirs(directory, exist_ok=True)
+
+    tasks, shared, grid_times = [], [], {}
+    try:
+        for name, p in named_variants(variants):
+            start = time.perf_counter()
+            arrays = SharedArrays(variant_grid(p))
+            grid_times[name] = time.perf_counter() - start
+            shared.append(arrays)
+            tasks.append((name, p, arrays.spec, directory))
+
+        # spawn: модули импортируются в процессах заново, без побочных действий
+        ctx = mp.get_context("spawn")
+        with ProcessPoolExecutor(max(1, min(workers, len(tasks))), mp_context=ctx) as pool:
+            index = []
+            for record in pool.map(_render_variant, tasks):
+                record["timings"]["grid"] = grid_times[record["name"]]
+                status = "ошибка: " + record["error"] if record["error"] else "готов"
+                print(f"Вариант '{record['name']}' {status}.")
+                index.append(record)
+    finally:
+        for arrays in shared:
+            arrays.release()
+
+    with open(os.path.join(directory, "index.json"), "w", encoding="utf-8") as fp:
+        json.dump(index, fp, indent=2, ensure_ascii=False)
+    return index
+
+
+if __name__ == "__main__":
+    # Пример: сектора разного раствора и круги G разного радиуса
+    run_sweep(parameter_grid(beta=[3 * np.pi / 4, np.pi], target_radius=[np.pi, 2.0]))
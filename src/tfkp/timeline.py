@@ -0,0 +1,104 @@
+import numpy as np
+
+# Функции сглаживания движения: t in [0, 1) -> доля пройденного пути
+EASINGS = {
+    "linear": lambda t: t,
+    "smooth": lambda t: t * t * (3 - 2 * t),
+    "cosine": lambda t: (1 - np.cos(np.pi * t)) / 2,
+}
+
+
+# =========================================================================
+# 1. ШАГИ СЦЕНАРИЯ АНИМАЦИИ
+# =========================================================================
+
+class Hold:
+    """Пауза на текущей сетке длиной frames кадров с заголовком title."""
+
+    def __init__(self, frames, title):
+        self.frames, self.title = frames, title
+
+    def __repr__(self):
+        return f"Hold({self.frames!r}, {self.title!r})"
+
+
+class Move:
+    """
+    Переход к следующей сетке за frames кадров с заголовком title;
+    easing — имя функции сглаживания из EASINGS.
+    """
+
+    def __init__(self, frames, title, easing="linear"):
+        if easing not in EASINGS:
+            raise ValueError(f"Неизвестное сглаживание: {easing!r}, ожидается одно из {tuple(EASINGS)}")
+        self.frames, self.title, self.easing = frames, title, easing
+
+    def __repr__(self):
+        return f"Move({self.frames!r}, {self.title!r}, {self.easing!r})"
+
+
+# =========================================================================
+# 2. ТАБЛИЦА КАДРОВ
+# =========================================================================
+
+class Timeline:
+    """
+    Сценарий анимации по цепочке сеток: последовательность шагов Hold и
+    Move. Каждый Move переводит анимацию на следующую сетку цепочки, так
+    что сценарий с n шагами Move рассчитан на n + 1 сетку.
+
+    Для каждого кадра заранее вычисляется строка таблицы (segment, t,
+    title): сетка интерполируется между positions[segment] и
+    positions[segment + 1] с параметром t (0 — пауза на positions[segment]).
+    timeline[frame] — выборка из таблицы за O(1), без перебора шагов.
+
+    scale умножает длительность всех шагов: Timeline(steps, scale=2) с
+    удвоенным fps дает ту же продолжительность с вдвое большим числом кадров.
+    """
+
+    def __init__(self, steps, scale=1):
+        self.steps = tuple(steps)
+        self.scale = scale
+        self.titles = tuple(dict.fromkeys(step.title for step in self.steps))
+        title_ids = {title: i for i, title in enumerate(self.titles)}
+
+        segment, t, title_index = [], [], []
+        current = 0
+        for step in self.steps:
+            n = max(int(round(step.frames * scale)), 1)
+            title_index.append(np.full(n, title_ids[step.title]))
+            segment.append(np.full(n, current))
+            if isinstance(step, Move):
+                t.append(EASINGS[step.easing](np.arange(n) / n))
+                current += 1
+            else:
+                t.append(np.zeros(n))
+
+        self.segments = current
+        self.segment = np.concatenate(segment)
+        self.t = np.concatenate(t)
+        self.title_index = np.concatenate(title_index)
+
+    def __len__(self):
+        return len(self.segment)
+
+    def __getitem__(self, frame):
+        """(segment, t, title) кадра frame."""
+        return self.segment[frame], self.t[frame], self.titles[self.title_index[frame]]
+
+    def __repr__(self):
+        return f"Timeline({list(self.steps)!r}, scale={self.scale!r})"
+
+    @property
+    def frames(self):
+        """Номера всех кадров — frames для gif_render.save_animation."""
+        return np.arange(len(self))
+
+    def position(self, frame, positions):
+        """Положение сетки в кадре frame по цепочке сеток positions."""
+        segment, t, _ = self[frame]
+        if t == 0:
+            return positions[segment]
+        # В одинарной точности t тоже float32, чтобы не повышать тип сеток
+        t = positions[segment].real.dtype.type(t)
+        return (1 - t) * positions[segment] + t * positions[segment + 1]
@@ -0,0 +1,268 @@
+import functools
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from tfkp.backend import run_ranges
+from tfkp.mapping_chain import CHUNK_SIZE
+
+
+# =========================================================================
+# 1. ОТОБРАЖЕНИЯ: ДРОБНО-ЛИНЕЙНЫЕ, СТЕПЕННЫЕ И ИХ ЦЕПОЧКИ
+# =========================================================================
+
+class Transform(ABC):
+    """
+    Отображение комплексной плоскости, применяемое к массивам numpy.
+
+    f @ g — композиция f(g(z)). Отображения сравниваются и хэшируются
+    по коэффициентам (key), поэтому составленные цепочки кэшируются.
+    """
+
+    @abstractmethod
+    def __call__(self, z, out=None):
+        """Образ точек z (в out, если задан)."""
+
+    @abstractmethod
+    def inverse(self):
+        """Обратное отображение."""
+
+    @abstractmethod
+    def key(self):
+        """Кортеж (вид, коэффициенты...) для сравнения и хэширования."""
+
+    def __matmul__(self, other):
+        return compose(self, other)
+
+    def __eq__(self, other):
+        return isinstance(other, Transform) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"{type(self).__name__}{self.key()[1:]}"
+
+
+def _output(z, out):
+    z = np.asarray(z)
+    if out is None:
+        out = np.empty(z.shape, dtype=np.result_type(z.dtype, np.complex64))
+    return z, out
+
+
+class Mobius(Transform):
+    """
+    Дробно-линейное отображение z -> (a z + b) / (c z + d), ad - bc != 0.
+
+    При c = 0 это аффинное отображение (a/d) z + b/d. Композиция двух
+    отображений — произведение матриц [[a, b], [c, d]], обратное —
+    матрица [[d, -b], [-c, a]], так что любая цепочка дробно-линейных
+    отображений вычисляется одним делением.
+    """
+
+    def __init__(self, a, b, c, d):
+        self.a, self.b, self.c, self.d = (complex(v) for v in (a, b, c, d))
+        if self.a * self.d - self.b * self.c == 0:
+            raise ValueError("Вырожденное дробно-линейное отображение: ad - bc = 0")
+
+    @classmethod
+    def affine(cls, a, b=0):
+        """Аффинное отображение z -> a z + b."""
+        return cls(a, b, 0, 1)
+
+    def key(self):
+        return ("mobius", self.a, self.b, self.c, self.d)
+
+    @property
+    def pole(self):
+        """Точка, переходящая в бесконечность (None для аффинного)."""
+        return None if self.c == 0 else -self.d / self.c
+
+    def inverse(self):
+        return Mobius(self.d, -self.b, -self.c, self.a)
+
+    def __call__(self, z, out=None, chunk_size=CHUNK_SIZE, backend=None):
+        """
+        Вычисляет отображение за один проход по блокам z; out может
+        совпадать с z. Умножения на 1 и сложения с 0 пропускаются, поэтому
+        результат побитово совпадает с записью формулы "как есть"
+        (например, (z - 1j) / (z + 1j) или np.pi * z). backend — способ
+        обхода блоков (backend.run_ranges).
+        """
+        z, out = _output(z, out)
+        if self.c == 0:
+            scale, shift = self.a / self.d, self.b / self.d
+            if scale != 1:
+                np.multiply(scale, z, out=out)
+            elif out is not z:
+                out[...] = z
+            if shift != 0:
+                np.add(out, shift, out=out)
+            return out
+
+        flat, target = z.reshape(-1), out.reshape(-1)
+        size = flat.size
+        n = min(chunk_size, size)
+
+        def body(begin, end):
+            den = np.empty(n, dtype=out.dtype)
+            for start in range(begin, end, n or 1):
+                stop = min(start + n, end)
+                src, num, d = flat[start:stop], target[start:stop], den[:stop - start]
+                # Знаменатель считается первым: num может совпадать с src
+                self._linear(src, self.c, self.d, d)
+                self._linear(src, self.a, self.b, num)
+                np.divide(num, d, out=num)
+
+        run_ranges(body, size, n or 1, backend)
+        return out
+
+    @staticmethod
+    def _linear(z, scale, shift, out):
+        # out = scale * z + shift
+        if scale == 1:
+            np.add(z, shift, out=out)
+        elif shift == 0:
+            np.multiply(scale, z, out=out)
+        else:
+            np.multiply(scale, z, out=out)
+            np.add(out, shift, out=out)
+
+
+class Power(Transform):
+    """
+    Степенное отображение z -> coef * z^n (n — натуральное).
+
+    branch задает ветвь обратного отображения Root: z = branch * w0, где
+    w0 — главный корень, т. е. образ поворачивается на branch так, чтобы
+    попасть в нужную область.
+    """
+
+    def __init__(self, n, coef=1, branch=1):
+        if int(n) != n or n < 1:
+            raise ValueError(f"Показатель степени должен быть натуральным: {n}")
+        self.n, self.coef, self.branch = int(n), complex(coef), complex(branch)
+
+    def key(self):
+        return ("power", self.n, self.coef, self.branch)
+
+    def inverse(self):
+        return Root(self.n, self.coef, self.branch)
+
+    def __call__(self, z, out=None):
+        z, out = _output(z, out)
+        if self.n == 2:
+            np.square(z, out=out)
+        else:
+            np.power(z, self.n, out=out)
+        if self.coef != 1:
+            np.multiply(self.coef, out, out=out)
+        return out
+
+
+class Root(Transform):
+    """
+    Обратное к Power(n, coef, branch): w -> branch * (w / (coef * branch^n))^(1/n)
+    с главной ветвью корня.
+    """
+
+    def __init__(self, n, coef=1, branch=1):
+        self.n, self.coef, self.branch = int(n), complex(coef), complex(branch)
+        self.factor = 1 / (self.coef * self.branch ** self.n)
+
+    def key(self):
+        return ("root", self.n, self.coef, self.branch)
+
+    def inverse(self):
+        return Power(self.n, self.coef, self.branch)
+
+    def __call__(self, z, out=None):
+        z, out = _output(z, out)
+        if self.factor != 1:
+            np.multiply(self.factor, z, out=out)
+        elif out is not z:
+            out[...] = z
+        if self.n == 2:
+            np.sqrt(out, out=out)
+        else:
+            np.power(out, 1 / self.n, out=out)
+        if self.branch != 1:
+            np.multiply(self.branch, out, out=out)
+        return out
+
+
+class Chain(Transform):
+    """Цепочка отображений, применяемых по порядку maps[0], maps[1], ..."""
+
+    def __init__(self, maps):
+        self.maps = tuple(maps)
+
+    def key(self):
+        return ("chain",) + tuple(m.key() for m in self.maps)
+
+    def inverse(self):
+        return Chain(m.inverse() for m in reversed(self.maps))
+
+    def __call__(self, z, out=None):
+        z = self.maps[0](z, out)
+        # Остальные звенья работают на месте в уже выделенном массиве
+        for m in self.maps[1:]:
+            z = m(z, out=z)
+        return z
+
+
+# =========================================================================
+# 2. КОМПОЗИЦИЯ С КЭШИРОВАНИЕМ
+# =========================================================================
+
+@functools.lru_cache(maxsize=None)
+def compose(*maps):
+    """
+    Композиция compose(f, g, h) = f(g(h(z))).
+
+    Вложенные цепочки разворачиваются, а соседние дробно-линейные
+    отображения перемножаются в одну матрицу. Результат кэшируется по
+    коэффициентам отображений.
+    """
+    # Порядок применения: последнее в записи применяется первым
+    flat = []
+    for m in reversed(maps):
+        flat.extend(m.maps if isinstance(m, Chain) else (m,))
+
+    merged = []
+    for m in flat:
+        if merged and isinstance(m, Mobius) and isinstance(merged[-1], Mobius):
+            g = merged.pop()
+            merged.append(Mobius(m.a * g.a + m.b * g.c, m.a * g.b + m.b * g.d,
+                                 m.c * g.a + m.d * g.c, m.c * g.b + m.d * g.d))
+        else:
+            merged.append(m)
+
+    if not merged:
+        return Mobius.affine(1)
+    if len(merged) == 1:
+        return merged[0]
+    return Chain(merged)
+
+
+# =========================================================================
+# 3. ЭТАПЫ ЗАДАЧИ: D -> H -> K -> G
+# =========================================================================
+
+# f1: z1 = -i z^2 (ветвь обратного: z = i sqrt(-i z1), верхняя полуплоскость
+# переходит в сектор D), f2: z2 = (z1 - i) / (z1 + i), f3: w = pi z2
+STAGE_MAPS = (Power(2, -1j, branch=1j), Mobius(1, -1j, 1, 1j), Mobius.affine(np.pi))
+
+
+@functools.lru_cache(maxsize=None)
+def stage_map(src, dst):
+    """
+    Отображение плоскости этапа src в плоскость этапа dst
+    (0 — D, 1 — H, 2 — K, 3 — G), в том числе обратное при src > dst.
+    Например, stage_map(1, 3) (H -> G) — одно дробно-линейное отображение
+    pi (z1 - i) / (z1 + i), а stage_map(3, 0) — корень от дробно-линейного.
+    """
+    if src <= dst:
+        return compose(*reversed(STAGE_MAPS[src:dst]))
+    return compose(*(m.inverse() for m in STAGE_MAPS[dst:src]))